@@ -349,7 +349,7 @@ WHERE course_id IS NULL;
 COMMENT ON TABLE attendance IS 'Tracks student attendance records';
 COMMENT ON COLUMN attendance.course_id IS 'NULL for general attendance, set for course-specific attendance';
 COMMENT ON COLUMN attendance.status IS 'Attendance status: present, absent, late, excused';
-COMMENT ON INDEX idx_unique_daily_attendance ON attendance IS 'Ensures one daily attendance record per student when not course-specific';
+COMMENT ON INDEX idx_unique_daily_attendance IS 'Ensures one daily attendance record per student when not course-specific';
 
 -- =====================================================
 -- CREATE TRIGGER FUNCTIONS
@@ -0,0 +1,101 @@
+-- =====================================================
+-- AI SCHOOL DASHBOARD - ANALYTICS ROLLUPS
+-- Version: 1.0
+-- Database: PostgreSQL 16+
+-- Description: Precomputed aggregates behind the dashboard views, and
+--              raw-scan views with the same columns to compare against
+-- Requires: 001_create_schema.sql
+-- =====================================================
+
+DROP TABLE IF EXISTS rollup_student_course_scores CASCADE;
+DROP TABLE IF EXISTS rollup_class_daily_attendance CASCADE;
+DROP TABLE IF EXISTS rollup_course_grade_histogram CASCADE;
+
+-- =====================================================
+-- RAW-SCAN VIEWS
+-- =====================================================
+
+-- View: Weighted score per student and course
+CREATE OR REPLACE VIEW v_student_course_scores AS
+SELECT
+    g.student_id,
+    g.course_id,
+    COUNT(*)::INTEGER AS grade_count,
+    SUM(COALESCE(g.weight, 1.0)) AS weight_sum,
+    SUM(g.grade * COALESCE(g.weight, 1.0)) AS weighted_sum,
+    ROUND(SUM(g.grade * COALESCE(g.weight, 1.0)) / NULLIF(SUM(COALESCE(g.weight, 1.0)), 0), 2) AS weighted_score
+FROM grades g
+GROUP BY g.student_id, g.course_id;
+
+COMMENT ON VIEW v_student_course_scores IS 'Weighted average grade per student and course, computed from grades';
+
+-- View: Attendance counts per homeroom class and day
+CREATE OR REPLACE VIEW v_class_daily_attendance AS
+SELECT
+    s.class_id,
+    a.date,
+    COUNT(*) FILTER (WHERE a.status = 'present')::INTEGER AS present,
+    COUNT(*) FILTER (WHERE a.status = 'absent')::INTEGER AS absent,
+    COUNT(*) FILTER (WHERE a.status = 'late')::INTEGER AS late,
+    COUNT(*) FILTER (WHERE a.status = 'excused')::INTEGER AS excused,
+    COUNT(*)::INTEGER AS total
+FROM attendance a
+JOIN students s ON s.id = a.student_id
+WHERE s.class_id IS NOT NULL
+GROUP BY s.class_id, a.date;
+
+COMMENT ON VIEW v_class_daily_attendance IS 'Attendance records per status for each class and day, computed from attendance';
+
+-- View: Grade distribution per course (bucket = whole grade points, 0..10)
+CREATE OR REPLACE VIEW v_course_grade_histogram AS
+SELECT
+    g.course_id,
+    FLOOR(g.grade)::SMALLINT AS bucket,
+    COUNT(*)::INTEGER AS grade_count
+FROM grades g
+GROUP BY g.course_id, FLOOR(g.grade);
+
+COMMENT ON VIEW v_course_grade_histogram IS 'Number of grades per whole-point bucket for each course, computed from grades';
+
+-- =====================================================
+-- ROLLUP TABLES (same columns as the views above)
+-- =====================================================
+
+CREATE TABLE rollup_student_course_scores (
+    student_id UUID NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+    course_id UUID NOT NULL REFERENCES courses(id) ON DELETE CASCADE,
+    grade_count INTEGER NOT NULL,
+    weight_sum DECIMAL(12, 2) NOT NULL,
+    weighted_sum DECIMAL(14, 4) NOT NULL,
+    weighted_score DECIMAL(5, 2),
+    PRIMARY KEY (student_id, course_id)
+);
+
+CREATE INDEX idx_rollup_scores_course ON rollup_student_course_scores(course_id);
+
+COMMENT ON TABLE rollup_student_course_scores IS 'Precomputed v_student_course_scores';
+
+CREATE TABLE rollup_class_daily_attendance (
+    class_id UUID NOT NULL REFERENCES classes(id) ON DELETE CASCADE,
+    date DATE NOT NULL,
+    present INTEGER NOT NULL,
+    absent INTEGER NOT NULL,
+    late INTEGER NOT NULL,
+    excused INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    PRIMARY KEY (class_id, date)
+);
+
+CREATE INDEX idx_rollup_attendance_date ON rollup_class_daily_attendance(date);
+
+COMMENT ON TABLE rollup_class_daily_attendance IS 'Precomputed v_class_daily_attendance';
+
+CREATE TABLE rollup_course_grade_histogram (
+    course_id UUID NOT NULL REFERENCES courses(id) ON DELETE CASCADE,
+    bucket SMALLINT NOT NULL,
+    grade_count INTEGER NOT NULL,
+    PRIMARY KEY (course_id, bucket),
+    CONSTRAINT check_bucket_range CHECK (bucket >= 0 AND bucket <= 10)
+);
+
+COMMENT ON TABLE rollup_course_grade_histogram IS 'Precomputed v_course_grade_histogram';
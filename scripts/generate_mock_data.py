@@ -5,35 +5,111 @@ Generates realistic test data for development and testing.
 
 Requirements:
     pip install faker psycopg2-binary python-dotenv
+    Optional extras (numpy, zstandard, pyarrow, asyncpg, pyyaml, aiohttp) are listed,
+    with the options that need them, in scripts/requirements.txt
 
 Usage:
-    python generate_mock_data_fixed.py --students 100 --teachers 20 --password YOUR_PASSWORD
+    python generate_mock_data.py --students 100 --teachers 20 --password YOUR_PASSWORD
+    python generate_mock_data.py --students 200000 --loader copy
+    python generate_mock_data.py benchmark --scales 1000,10000 --baseline benchmark_results.json
+    python generate_mock_data.py restore --dbname school_dashboard_test --students 200000 --loader copy
+    python generate_mock_data.py load --students 200000 --sessions 200 --duration 120 --account-password ...
 
 Author: AI School Dashboard Team
 Version: 1.1 (Fixed)
 """
 
 import argparse
+import asyncio
+import binascii
+import cProfile
+import csv
+import gzip
+import hashlib
+import heapq
+import inspect
+import io
 import json
+import os
+import platform
+import pstats
+import queue
 import random
+import shutil
+import subprocess
 import sys
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import deque, namedtuple
+from functools import lru_cache, wraps
+from itertools import chain
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from typing import List, Dict, Any, Iterable, Iterator, Sequence
 
 # Third-party imports
 try:
     from faker import Faker
     import psycopg2
+    from psycopg2 import sql
     from psycopg2.extras import execute_values
 except ImportError as e:
     print(f"Error: Missing required package - {e}")
     print("Install with: pip install faker psycopg2-binary python-dotenv")
     sys.exit(1)
 
+# Optional: vectorized generation engine (--engine numpy)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Optional: zstd-compressed dataset export (--compress zstd)
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Optional: columnar dataset export/import (--format parquet/arrow, --from-dataset)
+try:
+    import pyarrow as pa
+    import pyarrow.compute
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# Optional: asyncio loader with pipelined binary COPY (--loader async)
+try:
+    import asyncpg
+except ImportError:
+    asyncpg = None
+
+# Scenario files (--scenario): TOML via tomllib (Python 3.11+), YAML with PyYAML
+try:
+    import tomllib
+except ImportError:
+    tomllib = None
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+# Optional: HTTP client for the API load driver (load subcommand)
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
 # Initialize Faker with English locale only (avoid UTF8 encoding issues)
 fake = Faker('en_US')
-Faker.seed(42)
-random.seed(42)
+DEFAULT_SEED = 42
+Faker.seed(DEFAULT_SEED)
+random.seed(DEFAULT_SEED)
 
 # Constants
 CURRENT_ACADEMIC_YEAR = 2024
@@ -59,466 +135,3227 @@ EXAM_TYPES = {
     'midterm': 0.3,
     'final': 0.3
 }
+SCHOOLS = 1  # Schools sharing the database; class names get an S<nnn>- prefix when > 1
+SECTIONS_PER_GRADE = (3, 4)  # Min/max homeroom sections per grade level and school
+CLASS_MAX_STUDENTS = 40
+COURSE_CODE_LENGTH = 20  # courses.code is VARCHAR(20): <subject code><100..999>, then <1000...> once those run out
+
+DEFAULT_PASSWORD_HASH = '$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LewY5GyYIQn8Qzp.2'
+
+# Entity row types: fields are the table's columns in COPY/INSERT order, so lists of
+# rows load as-is (no per-row dicts, no dict -> tuple rebuild in insert_*)
+UserRow = namedtuple('UserRow', ['id', 'email', 'password_hash', 'role', 'is_active'])
+TeacherRow = namedtuple('TeacherRow', ['id', 'user_id', 'first_name', 'last_name', 'department', 'phone', 'hire_date'])
+ClassRow = namedtuple('ClassRow', ['id', 'name', 'grade_level', 'academic_year', 'teacher_id', 'room_number',
+                                   'max_students'])
+StudentRow = namedtuple('StudentRow', ['id', 'user_id', 'first_name', 'last_name', 'date_of_birth', 'gender',
+                                       'class_id', 'phone', 'address', 'parent_name', 'parent_phone', 'parent_email'])
+CourseRow = namedtuple('CourseRow', ['id', 'name', 'code', 'description', 'teacher_id', 'class_id', 'semester',
+                                     'academic_year', 'credits'])
+
+GRADE_COLUMNS = ['student_id', 'course_id', 'grade', 'exam_type', 'exam_date', 'weight', 'notes']
+ATTENDANCE_COLUMNS = ['student_id', 'course_id', 'date', 'status', 'notes']
+
+# Generation engines
+ENGINES = ['python', 'numpy']
+ATTENDANCE_STATUSES = ['present', 'absent', 'late', 'excused']
+EXAM_WINDOWS = {  # exam_type -> (start, end) in days relative to today, as used by Faker
+    'quiz': (-60, -30),
+    'assignment': (-45, -15),
+    'midterm': (-30, -10),
+    'final': (-10, 0)
+}
+NOTE_POOL_SIZE = 512  # Distinct note sentences per run for the numpy engine
+
+# Time-series workload (--workload timeseries)
+WORKLOADS = ['snapshot', 'timeseries']
+SEMESTER_DATES = {  # semester -> ((year offset, month, day) first day, last day) within an academic year
+    1: ((0, 9, 5), (1, 1, 15)),
+    2: ((1, 1, 16), (1, 5, 31))
+}
+PERIODS_PER_DAY = 5  # Timetabled periods per class per school day (Mon-Fri)
+TIMESERIES_EXAMS = {  # exam_type -> (count per course per semester, window as fractions of the semester)
+    'quiz': (3, 0.05, 0.9),
+    'assignment': (2, 0.1, 0.9),
+    'midterm': (1, 0.4, 0.6),
+    'final': (1, 0.9, 1.0)
+}
+
+# Faker value pools (--faker-pool-size): per-row Faker calls replaced by sampling from these
+POOLED_FAKER_FIELDS = ['first_name', 'last_name', 'phone_number', 'address', 'name', 'email', 'sentence']
+
+# Parallel generation settings
+SHARD_SIZE = 500  # Students per generation shard; each shard gets its own derived seed
+SHARD_ROWS = 50000  # Upper bound on the rows one grade/attendance shard builds before it is batched
+DISTINCT_RANK_LIMIT = 64  # Up to this many courses the numpy engine ranks them all; above it, draws and rejects duplicates
+WORKER_SETTINGS = {}  # Run settings init_worker replays in each worker process
+MOCK_DATA_NAMESPACE = uuid.UUID('4f1c2b8e-6a53-4d2e-9a0b-5c7e3d9f1a26')  # uuid5 namespace for entity IDs
+
+# Loader settings
+LOADERS = ['insert', 'copy', 'async', 'upsert']
+EXPORT_FORMATS = ['ndjson', 'csv', 'parquet', 'arrow']
+COLUMNAR_FORMATS = ['parquet', 'arrow']
+COMPRESSIONS = ['none', 'gzip', 'zstd']
+TABLE_ORDER = ['users', 'teachers', 'classes', 'students', 'courses', 'grades', 'attendance']
+
+# --rollups: rollup table -> (columns, raw-scan view with the same columns), from 002_create_rollups.sql
+ROLLUPS = {
+    'rollup_student_course_scores': (
+        ['student_id', 'course_id', 'grade_count', 'weight_sum', 'weighted_sum', 'weighted_score'],
+        'v_student_course_scores'
+    ),
+    'rollup_class_daily_attendance': (
+        ['class_id', 'date', 'present', 'absent', 'late', 'excused', 'total'],
+        'v_class_daily_attendance'
+    ),
+    'rollup_course_grade_histogram': (['course_id', 'bucket', 'grade_count'], 'v_course_grade_histogram')
+}
+
+# --fast-load: statement re-enabling a trigger, keyed by its original pg_trigger.tgenabled state
+TRIGGER_ENABLE = {
+    'O': 'ALTER TABLE {} ENABLE TRIGGER {}',
+    'R': 'ALTER TABLE {} ENABLE REPLICA TRIGGER {}',
+    'A': 'ALTER TABLE {} ENABLE ALWAYS TRIGGER {}'
+}
+FAST_LOAD_STATE = 'mock_data_fast_load'  # Table recording what --fast-load dropped until restore() puts it back
+
+# Checkpointed seeding (--checkpoint, --resume)
+CHECKPOINT_FILE = 'mock_data_checkpoint.json'
+CHECKPOINT_EVERY = 10  # Grade/attendance batches per commit
+CHECKPOINT_SETTINGS = [  # Arguments that change the generated rows; a resume must match them
+    'seed', 'students', 'teachers', 'grades', 'days', 'engine', 'workload', 'years', 'periods_per_day',
+    'batch_size', 'faker_pool_size', 'scenario', 'host', 'port', 'dbname'
+]
+
+# Scenario files (--scenario, --plan)
+SCENARIO_SECTIONS = ['name', 'description', 'run', 'layout', 'distributions', 'catalog']
+SCENARIO_RUN_OPTIONS = {  # [run] key -> type; the values become defaults of the matching options
+    'seed': int, 'students': int, 'teachers': int, 'grades': int, 'days': int, 'workload': str,
+    'years': int, 'periods_per_day': int, 'engine': str, 'loader': str, 'batch_size': int,
+    'workers': int, 'connections': int
+}
+SCENARIO_RUN_MIN_ONE = ['years', 'periods_per_day', 'batch_size', 'workers', 'connections']  # [run] ints that must be >= 1
+ROW_BYTES = {  # Approximate on-disk bytes per row including indexes (PostgreSQL 16, after VACUUM)
+    'users': 410, 'teachers': 300, 'classes': 250, 'students': 450, 'courses': 450,
+    'grades': 245, 'attendance': 280
+}
+DEFAULT_ROWS_PER_SEC = {'insert': 15000, 'copy': 25000, 'async': 30000, 'upsert': 15000}  # Rough rates without --benchmark-results
+
+# Instrumentation (--progress, --report, --profile)
+PROGRESS_INTERVAL = 0.5  # Seconds between progress line refreshes
+PROFILE_TOP = 25  # Functions / allocation sites listed by --profile
+
+# Benchmark suite (benchmark subcommand)
+BENCHMARK_SCALES = [1000, 10000]
+BENCHMARK_MIN_SECONDS = 0.5  # Table loads shorter than this are not compared against the baseline
+SCHEMA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'database', 'migrations',
+                           '001_create_schema.sql')
+ROLLUPS_SCHEMA_FILE = os.path.join(os.path.dirname(SCHEMA_FILE), '002_create_rollups.sql')  # Tables behind --rollups
+
+# Seeded snapshots (snapshot/restore subcommands)
+SNAPSHOT_TEMPLATE = 'school_dashboard_template'
+SNAPSHOT_COMMENT = 'generate_mock_data snapshot {key}'  # COMMENT ON DATABASE marking a seeded template
+
+# API load driver (load subcommand): weighted requests per session role, as route templates
+# of backend/routes/*.routes.js whose :params are filled from the seeded entity IDs
+LOAD_BASE_URL = 'http://localhost:5000/api'
+LOAD_LOGIN_ROUTE = ('POST', '/auth/login')
+LOAD_THROTTLED_SHARE = 0.1  # Warn when more than this share of requests is rate-limited (HTTP 429)
+LOAD_ACTIONS = {
+    'teacher': [
+        (3, 'GET', '/grades/course/:courseId'),
+        (3, 'GET', '/attendance/course/:courseId'),
+        (2, 'GET', '/classes/:classId/student'),
+        (1, 'GET', '/classes/:classId/course'),
+        (1, 'GET', '/students'),
+        (1, 'GET', '/auth/me')
+    ],
+    'student': [
+        (4, 'GET', '/grades/student/:studentId'),
+        (3, 'GET', '/attendance/student/:studentId'),
+        (1, 'GET', '/auth/me')
+    ]
+}
+
+# Arrow column types for columnar exports, keyed by column name (same name -> same type in every table)
+ARROW_COLUMN_TYPES = {
+    'id': 'uuid', 'user_id': 'uuid', 'teacher_id': 'uuid', 'class_id': 'uuid',
+    'student_id': 'uuid', 'course_id': 'uuid',
+    'role': 'enum', 'gender': 'enum', 'exam_type': 'enum', 'status': 'enum',
+    'is_active': 'bool',
+    'grade_level': 'int', 'academic_year': 'int', 'max_students': 'int', 'semester': 'int', 'credits': 'int',
+    'hire_date': 'date', 'date_of_birth': 'date', 'exam_date': 'date', 'date': 'date',
+    'grade': 'grade', 'weight': 'weight'
+}
+# Fixed dictionaries for enum columns, matching the PostgreSQL enum types in 001_create_schema.sql
+ARROW_ENUM_VALUES = {
+    'role': ['admin', 'teacher', 'parent', 'student'],
+    'gender': ['M', 'F', 'Other'],
+    'exam_type': ['midterm', 'final', 'quiz', 'assignment', 'project'],
+    'status': ATTENDANCE_STATUSES
+}
+BATCH_SIZE = 10000  # Rows per generated/loaded batch for grades and attendance
+COPY_SPOOL_SIZE = 64 * 1024 * 1024  # COPY buffers spill to disk above 64 MB
+
+def derive_seed(seed: int, *keys: Any) -> int:
+    """Derive a stable 64-bit seed for a phase/shard from the run seed"""
+    digest = hashlib.blake2b(repr((seed,) + keys).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+def entity_uuid(seed: int, table: str, key: Any) -> str:
+    """Deterministic UUID for an entity, derived from the run seed, table and index/natural key
+    
+    IDs are known before anything is loaded, so no RETURNING round-trips
+    are needed and related tables can be generated and loaded independently.
+    """
+    return str(uuid.uuid5(MOCK_DATA_NAMESPACE, f"{seed}/{table}/{key}"))
+
+def seed_generators(seed: int, *keys: Any):
+    """Reseed the global Faker and random generators for one phase/shard"""
+    derived = derive_seed(seed, *keys)
+    Faker.seed(derived)
+    random.seed(derived)
+
+def iter_shards(total: int, shard_size: int = SHARD_SIZE) -> Iterator[tuple]:
+    """Yield (shard, start, stop) index ranges covering range(total)"""
+    for shard, start in enumerate(range(0, total, shard_size)):
+        yield shard, start, min(start + shard_size, total)
+
+def rows_shard_size(rows_per_student: int) -> int:
+    """Students per shard so one shard builds at most SHARD_ROWS rows (and holds at most SHARD_SIZE students)
+    
+    A whole shard is materialized before it is cut into --batch-size
+    batches, so this, not the batch size, bounds generation memory.
+    """
+    return max(1, min(SHARD_SIZE, SHARD_ROWS // max(1, rows_per_student)))
+
+def split_sessions(sessions: List[tuple], rows_of) -> Iterator[List[tuple]]:
+    """Split one day's timeseries sessions into consecutive parts of at most ~SHARD_ROWS rows each"""
+    part, rows = [], 0
+    for session in sessions:
+        if part and rows + rows_of(session) > SHARD_ROWS:
+            yield part
+            part, rows = [], 0
+        part.append(session)
+        rows += rows_of(session)
+    if part:
+        yield part
+
+def init_worker(settings: Dict[str, Any]):
+    """Process pool initializer: replay the parent's WORKER_SETTINGS in a worker process"""
+    if 'scenario' in settings:
+        apply_scenario(settings['scenario'])
+    if 'pools' in settings:
+        install_value_pools(settings['pools'])
+
+def map_shards(fn, tasks: Iterable[tuple], workers: int = 1) -> Iterator[Any]:
+    """Run fn(*task) for each task and yield results in task order
+    
+    Runs in-process when workers <= 1. Otherwise tasks run in a process pool
+    with at most two tasks per worker in flight, so results never pile up.
+    Workers are set up by init_worker, so they see the same module settings
+    under the spawn and forkserver start methods as under fork.
+    """
+    if workers <= 1:
+        for task in tasks:
+            yield fn(*task)
+        return
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(dict(WORKER_SETTINGS),)) as executor:
+        pending = deque()
+        try:
+            for task in tasks:
+                pending.append(executor.submit(fn, *task))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+def build_value_pools(seed: int, size: int, cache_path: str = None) -> Dict[str, List[str]]:
+    """Generate seeded pools of Faker values, or load them from cache_path when it matches"""
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path, encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get('seed') == seed and cached.get('size') == size and set(cached['pools']) == set(POOLED_FAKER_FIELDS):
+            print(f"✓ Loaded Faker value pools ({size} values per field) from {cache_path}")
+            return cached['pools']
+    
+    pool_faker = Faker('en_US')
+    pool_faker.seed_instance(derive_seed(seed, 'pools'))
+    pools = {field: [getattr(pool_faker, field)() for _ in range(size)] for field in POOLED_FAKER_FIELDS}
+    
+    if cache_path:
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump({'seed': seed, 'size': size, 'pools': pools}, f, ensure_ascii=False)
+    
+    print(f"✓ Built Faker value pools ({size} values per field)")
+    return pools
+
+class PooledFaker:
+    """Faker stand-in that samples pooled values by index instead of calling Faker per row
+    
+    Sampling uses the global random module, so shard seeding keeps output
+    deterministic. Fields without a pool fall through to the wrapped Faker.
+    """
+    
+    def __init__(self, faker: Faker, pools: Dict[str, List[str]]):
+        self.faker = faker
+        self.pools = pools
+    
+    def __getattr__(self, name: str):
+        pool = self.__dict__['pools'].get(name)
+        if pool is None:
+            return getattr(self.__dict__['faker'], name)
+        return lambda: pool[random.randrange(len(pool))]
+
+def install_value_pools(pools: Dict[str, List[str]]):
+    """Swap the module-level fake for a PooledFaker over pools, here and in map_shards workers"""
+    global fake
+    # Forked workers already hold the parent's PooledFaker: re-wrap its Faker, not it
+    fake = PooledFaker(fake.faker if isinstance(fake, PooledFaker) else fake, pools)
+    WORKER_SETTINGS['pools'] = pools
+
+def _copy_value(value: Any) -> str:
+    """Encode a Python value for COPY text format"""
+    if value is None:
+        return '\\N'
+    if value is True:
+        return 't'
+    if value is False:
+        return 'f'
+    if isinstance(value, str):
+        return (value.replace('\\', '\\\\')
+                     .replace('\t', '\\t')
+                     .replace('\n', '\\n')
+                     .replace('\r', '\\r'))
+    return str(value)
+
+def copy_rows(conn, table: str, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> int:
+    """Stream rows into a table with COPY ... FROM STDIN and return the row count"""
+    count = 0
+    with tempfile.SpooledTemporaryFile(max_size=COPY_SPOOL_SIZE, mode='w+', encoding='utf-8') as buffer:
+        for row in rows:
+            buffer.write('\t'.join([_copy_value(v) for v in row]))
+            buffer.write('\n')
+            count += 1
+        buffer.seek(0)
+        
+        cursor = conn.cursor()
+        cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buffer)
+        cursor.close()
+    
+    return count
+
+def copy_columns(conn, table: str, columns: Sequence[str], batch: Dict[str, Any]) -> int:
+    """COPY a columnar batch (column name -> array) without building row tuples"""
+    text_columns = []
+    for name in columns:
+        column = batch[name]
+        if column.dtype == object:
+            text_columns.append([_copy_value(v) for v in column])
+        else:
+            text_columns.append(column.astype(str).tolist())  # dates render as YYYY-MM-DD
+    
+    with tempfile.SpooledTemporaryFile(max_size=COPY_SPOOL_SIZE, mode='w+', encoding='utf-8') as buffer:
+        for row in zip(*text_columns):
+            buffer.write('\t'.join(row))
+            buffer.write('\n')
+        buffer.seek(0)
+        
+        cursor = conn.cursor()
+        cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buffer)
+        cursor.close()
+    
+    return batch_len(batch)
+
+def batch_len(batch) -> int:
+    """Number of rows in a batch of row tuples or columns"""
+    if isinstance(batch, dict):
+        return len(next(iter(batch.values())))
+    return len(batch)
+
+def slice_batch(batch, start: int, stop: int):
+    """Rows start..stop-1 of a batch of row tuples or columns"""
+    if isinstance(batch, dict):
+        return {name: column[start:stop] for name, column in batch.items()}
+    return batch[start:stop]
+
+def batch_rows(batch, columns: Sequence[str]) -> List[tuple]:
+    """Row tuples for a batch of row tuples or columns"""
+    if isinstance(batch, dict):
+        return list(zip(*(batch[name].tolist() for name in columns)))
+    return batch
+
+# --loader upsert: merge statement per table, and rows inserted/skipped per table
+_upsert_statements = {}
+upsert_counts = {}
+_upsert_lock = threading.Lock()
+
+def _upsert_statement(conn, table: str, columns: Sequence[str]) -> str:
+    """INSERT ... SELECT from the staging table that skips conflicting, duplicate and orphaned rows
+    
+    Tables with no unique key among the loaded columns (grades, and
+    course-level attendance, get server-generated IDs) skip rows identical to
+    one already stored. Rows whose foreign keys point at parents that are not
+    in the database (because the parent row was itself skipped) are filtered
+    out too, so a conflict never cascades into a foreign-key error.
+    """
+    key = (table, tuple(columns))
+    if key not in _upsert_statements:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT a.attname, k.confrelid::regclass::text, af.attname
+            FROM pg_constraint k
+            JOIN pg_attribute a ON a.attrelid = k.conrelid AND a.attnum = k.conkey[1]
+            JOIN pg_attribute af ON af.attrelid = k.confrelid AND af.attnum = k.confkey[1]
+            WHERE k.conrelid = %s::regclass AND k.contype = 'f' AND cardinality(k.conkey) = 1
+        """, (table,))
+        foreign_keys = [fk for fk in cursor.fetchall() if fk[0] in columns]
+        cursor.execute("""
+            SELECT EXISTS (
+                SELECT 1 FROM pg_index x
+                WHERE x.indrelid = %s::regclass AND x.indisunique
+                  AND x.indpred IS NULL AND x.indexprs IS NULL
+                  AND (SELECT array_agg(attname::text) FROM pg_attribute
+                       WHERE attrelid = x.indrelid AND attnum = ANY(x.indkey)) <@ %s::text[]
+            )
+        """, (table, list(columns)))
+        has_key = cursor.fetchone()[0]
+        cursor.execute("SELECT attname, attnotnull FROM pg_attribute WHERE attrelid = %s::regclass AND attnum > 0",
+                       (table,))
+        not_null = dict(cursor.fetchall())
+        cursor.close()
+        
+        conditions = [
+            sql.SQL("(s.{0} IS NULL OR EXISTS (SELECT 1 FROM {1} p WHERE p.{2} = s.{0}))").format(
+                sql.Identifier(column), sql.Identifier(parent), sql.Identifier(parent_column))
+            for column, parent, parent_column in foreign_keys
+        ]
+        if not has_key:
+            # = on NOT NULL columns lets the planner probe an index on them
+            conditions.append(sql.SQL("NOT EXISTS (SELECT 1 FROM {} t WHERE {})").format(
+                sql.Identifier(table),
+                sql.SQL(' AND ').join(
+                    sql.SQL("t.{0} = s.{0}" if not_null[c] else "t.{0} IS NOT DISTINCT FROM s.{0}").format(
+                        sql.Identifier(c))
+                    for c in columns
+                )
+            ))
+        _upsert_statements[key] = sql.SQL(
+            "INSERT INTO {table} ({columns}) SELECT {selected} FROM {stage} s {where} ON CONFLICT DO NOTHING"
+        ).format(
+            table=sql.Identifier(table),
+            columns=sql.SQL(', ').join(map(sql.Identifier, columns)),
+            selected=sql.SQL(', ').join(sql.SQL('s.') + sql.Identifier(c) for c in columns),
+            stage=sql.Identifier(f"stage_{table}"),
+            where=sql.SQL('WHERE ') + sql.SQL(' AND ').join(conditions) if conditions else sql.SQL('')
+        ).as_string(conn)
+    return _upsert_statements[key]
+
+def upsert_batch(conn, table: str, columns: Sequence[str], values) -> int:
+    """COPY a batch into a session-private staging table, merge it with ON CONFLICT DO NOTHING
+    and return the rows inserted (the rest are counted as skipped in upsert_counts)
+    """
+    stage = f"stage_{table}"
+    cursor = conn.cursor()
+    # Temporary tables are never WAL-logged and belong to this connection, so
+    # load_parallel's connections each get their own
+    cursor.execute(sql.SQL("CREATE TEMP TABLE IF NOT EXISTS {} AS SELECT {} FROM {} WITH NO DATA").format(
+        sql.Identifier(stage), sql.SQL(', ').join(map(sql.Identifier, columns)), sql.Identifier(table)))
+    if isinstance(values, dict):
+        count = copy_columns(conn, stage, columns, values)
+    else:
+        count = copy_rows(conn, stage, columns, values)
+    cursor.execute(_upsert_statement(conn, table, columns))
+    inserted = cursor.rowcount
+    cursor.execute(sql.SQL("TRUNCATE {}").format(sql.Identifier(stage)))
+    cursor.close()
+    
+    with _upsert_lock:
+        totals = upsert_counts.setdefault(table, [0, 0])
+        totals[0] += inserted
+        totals[1] += count - inserted
+    return inserted
+
+def report_rate(table: str, count: int, started: float, ended: float = None):
+    """Print rows/sec for a table load between perf_counter() values (default: until now)"""
+    elapsed = (ended or time.perf_counter()) - started
+    rate = count / elapsed if elapsed > 0 else float('inf')
+    print(f"  ⏱  {table}: {count} rows in {elapsed:.2f}s ({rate:,.0f} rows/sec)")
+
+class Phase:
+    """Wall time, rows and per-batch latencies of one generate_*/insert_* phase"""
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.started = None
+        self.ended = None
+        self.rows = 0
+        self.latencies = []  # seconds per batch generated/loaded
+        self.expected = None  # estimated total rows, for the progress ETA
+        self.memory = None  # (current, peak) traced bytes when --profile is on
+    
+    def report(self) -> Dict[str, Any]:
+        """JSON-ready summary of the phase"""
+        seconds = (self.ended or time.perf_counter()) - (self.started or time.perf_counter())
+        latencies = sorted(self.latencies)
+        summary = {
+            'name': self.name,
+            'seconds': round(seconds, 4),
+            'busy_seconds': round(sum(latencies) if latencies else seconds, 4),
+            'rows': self.rows,
+            'rows_per_sec': round(self.rows / seconds, 1) if seconds > 0 else None,
+            'batches': len(latencies)
+        }
+        if latencies:
+            summary['batch_ms'] = {
+                'min': round(latencies[0] * 1000, 3),
+                'p50': round(latencies[len(latencies) // 2] * 1000, 3),
+                'p95': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 3),
+                'max': round(latencies[-1] * 1000, 3)
+            }
+        if self.memory:
+            summary['memory_bytes'] = {'current': self.memory[0], 'peak': self.memory[1]}
+        return summary
+
+class Instrumentation:
+    """Per-phase timers and batch latencies, the --progress line and the --report JSON
+    
+    Phases are keyed by name, so repeated calls (and load_parallel threads
+    loading the same table) accumulate into one entry. For generator phases
+    busy_seconds is the time spent producing batches; for insert phases it
+    is the time spent in load_batch, so the two separate generation cost
+    from network/server cost.
+    """
+    
+    def __init__(self):
+        self.phases = {}
+        self.progress = False
+        self.trace_memory = False
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._last_progress = 0.0
+    
+    def get(self, name: str) -> Phase:
+        with self._lock:
+            if name not in self.phases:
+                self.phases[name] = Phase(name)
+            return self.phases[name]
+    
+    def begin(self, name: str) -> Phase:
+        """Start a phase's clock unless an earlier call already did"""
+        phase = self.get(name)
+        if phase.started is None:
+            phase.started = time.perf_counter()
+        return phase
+    
+    def expect(self, name: str, rows: int):
+        """Set the estimated row total used for the progress ETA"""
+        self.get(name).expected = int(rows)
+    
+    def add(self, name: str, rows: int, seconds: float = None, show: bool = True):
+        """Record rows (and one batch latency) for a phase"""
+        phase = self.get(name)
+        with self._lock:
+            if phase.started is None:
+                phase.started = time.perf_counter() - (seconds or 0)
+            phase.rows += rows
+            if seconds is not None:
+                phase.latencies.append(seconds)
+            phase.ended = time.perf_counter()
+        if self.progress and show:
+            self._show_progress(phase)
+    
+    def end(self, name: str):
+        phase = self.get(name)
+        phase.ended = time.perf_counter()
+        if self.trace_memory:
+            phase.memory = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+        if self.progress:
+            sys.stderr.write('\r\033[K')
+    
+    def _show_progress(self, phase: Phase):
+        now = time.perf_counter()
+        if now - self._last_progress < PROGRESS_INTERVAL:
+            return
+        self._last_progress = now
+        elapsed = now - phase.started
+        rate = phase.rows / elapsed if elapsed > 0 else 0
+        line = f"⏳ {phase.name}: {phase.rows:,} rows, {rate:,.0f} rows/sec, {elapsed:.0f}s"
+        if phase.expected and rate > 0:
+            done = min(phase.rows / phase.expected, 1.0)
+            line += f", {done:.0%}, ETA {max(phase.expected - phase.rows, 0) / rate:.0f}s"
+        sys.stderr.write('\r\033[K' + line)
+        sys.stderr.flush()
+    
+    def report(self) -> Dict[str, Any]:
+        return {
+            'total_seconds': round(time.perf_counter() - self.started, 4),
+            'phases': [
+                phase.report()
+                for phase in sorted(self.phases.values(), key=lambda p: p.started or float('inf'))
+            ]
+        }
+
+instruments = Instrumentation()
+
+def instrumented(fn):
+    """Record every call of a generate_*/insert_* function as a phase named after it
+    
+    Generator functions are timed per yielded batch; other functions are timed
+    as a whole, with the returned list length or count as rows unless their
+    loads already recorded rows.
+    """
+    if inspect.isgeneratorfunction(fn):
+        @wraps(fn)
+        def generator_wrapper(*args, **kwargs):
+            batches = fn(*args, **kwargs)
+            instruments.begin(fn.__name__)
+            while True:
+                started = time.perf_counter()
+                try:
+                    batch = next(batches)
+                except StopIteration:
+                    break
+                instruments.add(fn.__name__, batch_len(batch), time.perf_counter() - started, show=False)
+                yield batch
+            instruments.end(fn.__name__)
+        return generator_wrapper
+    
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        phase = instruments.begin(fn.__name__)
+        rows_before = phase.rows
+        try:
+            result = fn(*args, **kwargs)
+        finally:
+            instruments.end(fn.__name__)
+        if phase.rows == rows_before:
+            phase.rows += result if isinstance(result, int) else len(result) if isinstance(result, list) else 1
+        return result
+    return wrapper
+
+def _arrow_type(name: str) -> 'pa.DataType':
+    kind = ARROW_COLUMN_TYPES.get(name, 'string')
+    return {
+        'uuid': pa.uuid() if hasattr(pa, 'uuid') else pa.binary(16),
+        'enum': pa.dictionary(pa.int8(), pa.string()),
+        'bool': pa.bool_(),
+        'int': pa.int32(),
+        'date': pa.date32(),
+        'grade': pa.decimal128(4, 2),
+        'weight': pa.decimal128(3, 2),
+        'string': pa.string()
+    }[kind]
+
+def _arrow_uuid_array(values: List[Any]) -> 'pa.Array':
+    """UUID strings (or None) -> 16-byte Arrow UUID array"""
+    n = len(values)
+    nulls = [v is None for v in values]
+    hex_digits = ''.join(['0' * 32 if v is None else v for v in values]).replace('-', '')
+    storage = pa.FixedSizeBinaryArray.from_buffers(pa.binary(16), n, [None, pa.py_buffer(bytes.fromhex(hex_digits))])
+    if any(nulls):
+        storage = pa.array(storage.to_numpy(zero_copy_only=False), pa.binary(16), mask=np.array(nulls))
+    if hasattr(pa, 'uuid'):
+        return pa.ExtensionArray.from_storage(pa.uuid(), storage)
+    return storage
+
+def _uuid_strings(array: 'pa.Array') -> 'pa.Array':
+    """16-byte Arrow UUID array -> canonical UUID strings, vectorized"""
+    storage = array.storage if isinstance(array, pa.ExtensionArray) else array
+    n = len(storage)
+    raw = storage.buffers()[1][storage.offset * 16:(storage.offset + n) * 16]
+    digits = np.frombuffer(binascii.hexlify(raw), dtype='S1').reshape(n, 32)
+    dashed = np.insert(digits, [8, 12, 16, 20], b'-', axis=1).copy().view('S36').ravel()
+    return pa.array(dashed, pa.binary(36), mask=storage.is_null().to_numpy(zero_copy_only=False)).cast(pa.string())
+
+def to_record_batch(columns: Sequence[str], batch) -> 'pa.RecordBatch':
+    """Typed Arrow record batch for a batch of row tuples or columns"""
+    arrays = []
+    for i, name in enumerate(columns):
+        if isinstance(batch, dict):
+            values = batch[name]
+            values = values.tolist() if values.dtype == object else values
+        else:
+            values = [row[i] for row in batch]
+        
+        arrow_type = _arrow_type(name)
+        kind = ARROW_COLUMN_TYPES.get(name, 'string')
+        if kind == 'uuid':
+            arrays.append(_arrow_uuid_array(values))
+        elif kind == 'enum':
+            # One fixed dictionary per column, as Arrow IPC files require
+            strings = pa.array(values, pa.string())
+            dictionary = pa.array(ARROW_ENUM_VALUES[name], pa.string())
+            indices = pa.compute.index_in(strings, value_set=dictionary)
+            if indices.null_count != strings.null_count:
+                raise ValueError(f"Unexpected {name} value; expected one of {ARROW_ENUM_VALUES[name]}")
+            arrays.append(pa.DictionaryArray.from_arrays(indices.cast(pa.int8()), dictionary))
+        elif kind in ('grade', 'weight'):
+            arrays.append(pa.array(values, pa.float64()).cast(arrow_type, safe=False))  # rounds half-even
+        else:
+            arrays.append(pa.array(values, arrow_type))
+    
+    return pa.RecordBatch.from_arrays(arrays, names=list(columns))
+
+def copy_record_batch(conn, table: str, record_batch: 'pa.RecordBatch') -> int:
+    """COPY an Arrow record batch through Arrow's CSV writer"""
+    arrays = [
+        _uuid_strings(column) if ARROW_COLUMN_TYPES.get(name) == 'uuid' else column
+        for name, column in zip(record_batch.schema.names, record_batch.columns)
+    ]
+    buffer = io.BytesIO()
+    pa_csv.write_csv(
+        pa.RecordBatch.from_arrays(arrays, names=record_batch.schema.names), buffer,
+        pa_csv.WriteOptions(include_header=False)
+    )
+    buffer.seek(0)
+    
+    cursor = conn.cursor()
+    cursor.copy_expert(
+        f"COPY {table} ({', '.join(record_batch.schema.names)}) FROM STDIN WITH (FORMAT csv)", buffer
+    )
+    cursor.close()
+    return record_batch.num_rows
+
+class DatasetWriter:
+    """Connection stand-in that writes each table to its own NDJSON/CSV/Parquet/Arrow file
+    
+    Batches are appended as they are generated (one row group or record
+    batch per batch for columnar formats), so exports of any size stream
+    to disk. commit() flushes the files and writes manifest.json.
+    """
+    
+    def __init__(self, directory: str, fmt: str = 'ndjson', compression: str = 'none', metadata: Dict[str, Any] = None):
+        self.directory = directory
+        self.fmt = fmt
+        self.compression = compression
+        self.metadata = metadata or {}
+        self.files = {}
+        self.counts = {}
+        os.makedirs(directory, exist_ok=True)
+    
+    def path(self, table: str) -> str:
+        if self.fmt in COLUMNAR_FORMATS:
+            return os.path.join(self.directory, f"{table}.{self.fmt}")  # compressed internally
+        suffix = {'none': '', 'gzip': '.gz', 'zstd': '.zst'}[self.compression]
+        return os.path.join(self.directory, f"{table}.{self.fmt}{suffix}")
+    
+    def _open(self, table: str, columns: Sequence[str], schema=None):
+        path = self.path(table)
+        if self.fmt == 'parquet':
+            handle = pq.ParquetWriter(path, schema, compression=self.compression)
+        elif self.fmt == 'arrow':
+            compression = None if self.compression == 'none' else 'zstd'  # IPC supports lz4/zstd only
+            handle = pa.ipc.new_file(path, schema, options=pa.ipc.IpcWriteOptions(compression=compression))
+        elif self.compression == 'gzip':
+            handle = gzip.open(path, 'wt', encoding='utf-8', newline='', compresslevel=6)
+        elif self.compression == 'zstd':
+            raw = zstandard.ZstdCompressor(level=3).stream_writer(open(path, 'wb'))
+            handle = io.TextIOWrapper(raw, encoding='utf-8', newline='')
+        else:
+            handle = open(path, 'w', encoding='utf-8', newline='')
+        
+        writer = csv.writer(handle) if self.fmt == 'csv' else None
+        if writer:
+            writer.writerow(columns)
+        self.files[table] = (handle, writer)
+        self.counts[table] = 0
+        return self.files[table]
+    
+    def write(self, table: str, columns: Sequence[str], batch) -> int:
+        """Append a batch of row tuples or columns to the table's file"""
+        if self.fmt in COLUMNAR_FORMATS:
+            record_batch = to_record_batch(columns, batch)
+            handle, _ = self.files.get(table) or self._open(table, columns, record_batch.schema)
+            if self.fmt == 'parquet':
+                handle.write_batch(record_batch)
+            else:
+                handle.write(record_batch)
+            self.counts[table] += record_batch.num_rows
+            return record_batch.num_rows
+        
+        handle, writer = self.files.get(table) or self._open(table, columns)
+        rows = batch_rows(batch, columns)
+        
+        if writer:
+            writer.writerows(rows)
+        else:
+            handle.writelines(
+                json.dumps(dict(zip(columns, row)), default=str, ensure_ascii=False) + '\n' for row in rows
+            )
+        
+        self.counts[table] += len(rows)
+        return len(rows)
+    
+    def commit(self):
+        if self.fmt in COLUMNAR_FORMATS:
+            self.close()  # Parquet/Arrow footers are written on close
+        for handle, _ in self.files.values():
+            handle.flush()
+        manifest = dict(self.metadata, format=self.fmt, compression=self.compression, tables={
+            table: {'file': os.path.basename(self.path(table)), 'rows': count}
+            for table, count in self.counts.items()
+        })
+        with open(os.path.join(self.directory, 'manifest.json'), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+    
+    def rollback(self):
+        pass  # Partial files are left in place for inspection; manifest.json is only written on commit
+    
+    def close(self):
+        for handle, _ in self.files.values():
+            handle.close()
+        self.files = {}
+
+def target_name(conn) -> str:
+    """Where rows end up, for progress messages"""
+    return 'dataset' if isinstance(conn, DatasetWriter) else 'database'
+
+def _open_text(path: str, compression: str):
+    """Open a (possibly compressed) dataset file for reading as text"""
+    if compression == 'gzip':
+        return gzip.open(path, 'rt', encoding='utf-8', newline='')
+    if compression == 'zstd':
+        raw = zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'))
+        return io.TextIOWrapper(raw, encoding='utf-8', newline='')
+    return open(path, 'r', encoding='utf-8', newline='')
+
+def load_dataset_table(conn, table: str, path: str, fmt: str, compression: str, batch_size: int = BATCH_SIZE) -> int:
+    """COPY one exported table file into the database and return the row count"""
+    count = 0
+    
+    if fmt == 'parquet':
+        # Memory-mapped: row groups are decoded straight from the page cache
+        for record_batch in pq.ParquetFile(pa.memory_map(path)).iter_batches(batch_size=batch_size):
+            count += copy_record_batch(conn, table, record_batch)
+    elif fmt == 'arrow':
+        reader = pa.ipc.open_file(pa.memory_map(path))
+        for i in range(reader.num_record_batches):
+            count += copy_record_batch(conn, table, reader.get_batch(i))
+    elif fmt == 'csv':
+        with _open_text(path, compression) as f:
+            columns = next(csv.reader([f.readline()]))
+            cursor = conn.cursor()
+            cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", f)
+            count = cursor.rowcount
+            cursor.close()
+    else:
+        with _open_text(path, compression) as f:
+            batch = []
+            columns = None
+            for line in f:
+                record = json.loads(line)
+                columns = columns or list(record)
+                batch.append(tuple(record[c] for c in columns))
+                if len(batch) >= batch_size:
+                    count += copy_rows(conn, table, columns, batch)
+                    batch = []
+            if batch:
+                count += copy_rows(conn, table, columns, batch)
+    
+    return count
+
+def load_dataset(conn, directory: str, batch_size: int = BATCH_SIZE) -> Dict[str, int]:
+    """Load an exported dataset directory (see DatasetWriter) in foreign-key order"""
+    with open(os.path.join(directory, 'manifest.json'), encoding='utf-8') as f:
+        manifest = json.load(f)
+    
+    fmt, compression = manifest['format'], manifest['compression']
+    print(f"📁 Dataset: {fmt} (compression: {compression}), seed {manifest.get('seed')}")
+    
+    counts = {}
+    for table in TABLE_ORDER:
+        if table not in manifest['tables']:
+            continue
+        started = time.perf_counter()
+        path = os.path.join(directory, manifest['tables'][table]['file'])
+        counts[table] = load_dataset_table(conn, table, path, fmt, compression, batch_size)
+        print(f"✓ Loaded {counts[table]} {table} rows into database")
+        report_rate(table, counts[table], started)
+    
+    return counts
+
+def load_batch(conn, table: str, columns: Sequence[str], values, loader: str) -> int:
+    """Load one batch of row tuples or columns into a table with the selected loader
+    
+    The batch latency is recorded under the insert_<table> phase.
+    """
+    started = time.perf_counter()
+    if isinstance(conn, DatasetWriter):
+        count = conn.write(table, columns, values)
+    elif loader in ('copy', 'async'):  # async pipelines only the streamed tables (load_async)
+        if isinstance(values, dict):
+            count = copy_columns(conn, table, columns, values)
+        else:
+            count = copy_rows(conn, table, columns, values)
+    elif loader == 'upsert':
+        count = upsert_batch(conn, table, columns, values)
+    else:
+        values = batch_rows(values, columns)
+        cursor = conn.cursor()
+        query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s"
+        execute_values(cursor, query, values)
+        cursor.close()
+        count = len(values)
+    
+    instruments.add(f'insert_{table}', count, time.perf_counter() - started)
+    return count
+
+def load_rows(conn, table: str, columns: Sequence[str], values: List[tuple], loader: str) -> int:
+    """Load a whole table's rows (IDs included) in one pass and report rows/sec"""
+    started = time.perf_counter()
+    count = load_batch(conn, table, columns, values, loader)
+    report_rate(table, count, started)
+    return count
+
+def load_parallel(connect, streams: List[tuple], connections: int, loader: str) -> Dict[str, int]:
+    """Fan (table, columns, batches) streams out over a pool of connections
+    
+    Each connection loads whole batches inside its own transaction. All
+    connections commit only after every batch has loaded; on any failure
+    all of them roll back and the error is re-raised.
+    """
+    conns = [connect() for _ in range(connections)]
+    batches = queue.Queue(maxsize=2 * connections)
+    counts = {table: 0 for table, _, _ in streams}
+    started = {}
+    finished = {}
+    errors = []
+    lock = threading.Lock()
+    
+    def worker(conn):
+        while True:
+            item = batches.get()
+            if item is None:
+                return
+            if errors:
+                continue  # Drain the queue so the producer never blocks
+            table, columns, batch = item
+            try:
+                count = load_batch(conn, table, columns, batch, loader)
+            except Exception as e:
+                errors.append(e)
+                continue
+            with lock:
+                counts[table] += count
+                finished[table] = time.perf_counter()
+    
+    threads = [threading.Thread(target=worker, args=(c,), daemon=True) for c in conns]
+    for thread in threads:
+        thread.start()
+    
+    try:
+        try:
+            for table, columns, stream in streams:
+                started[table] = time.perf_counter()
+                for batch in stream:
+                    if errors:
+                        break
+                    batches.put((table, columns, batch))
+        finally:
+            for _ in threads:
+                batches.put(None)
+            for thread in threads:
+                thread.join()
+        
+        if errors:
+            raise errors[0]
+        for conn in conns:
+            conn.commit()
+    except Exception:
+        for conn in conns:
+            conn.rollback()
+        raise
+    finally:
+        for conn in conns:
+            conn.close()
+    
+    for table, _, _ in streams:
+        print(f"✓ Inserted {counts[table]} {table} rows into database over {connections} connections")
+        report_rate(table, counts[table], started[table], finished.get(table))
+    return counts
+
+async def _load_async(connect_kwargs: Dict[str, Any], streams: List[tuple], connections: int,
+                      counts: Dict[str, int], started: Dict[str, float], finished: Dict[str, float]):
+    """Coroutine behind load_async: one producer task, one COPY task per connection"""
+    loop = asyncio.get_running_loop()
+    batches = asyncio.Queue(maxsize=2 * connections)
+    conns = []
+    transactions = []
+    
+    async def produce():
+        for table, columns, stream in streams:
+            started[table] = time.perf_counter()
+            iterator = iter(stream)
+            while True:
+                # Generate in a thread so the event loop keeps queued batches in flight meanwhile
+                batch = await loop.run_in_executor(None, next, iterator, None)
+                if batch is None:
+                    break
+                await batches.put((table, columns, batch))
+        for _ in conns:
+            await batches.put(None)
+    
+    async def consume(conn):
+        while True:
+            item = await batches.get()
+            if item is None:
+                return
+            table, columns, batch = item
+            batch_started = time.perf_counter()
+            await conn.copy_records_to_table(table, records=batch_rows(batch, columns), columns=columns)
+            count = batch_len(batch)
+            instruments.add(f'insert_{table}', count, time.perf_counter() - batch_started)
+            counts[table] += count
+            finished[table] = time.perf_counter()
+    
+    try:
+        for _ in range(connections):
+            conn = await asyncpg.connect(**connect_kwargs)
+            conns.append(conn)
+            transactions.append(conn.transaction())
+            await transactions[-1].start()
+        
+        tasks = [asyncio.create_task(produce())] + [asyncio.create_task(consume(conn)) for conn in conns]
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        for task in done:
+            if task.exception():
+                raise task.exception()
+        
+        for transaction in transactions:
+            await transaction.commit()
+    except BaseException:
+        for transaction in transactions:
+            try:
+                await transaction.rollback()
+            except Exception:
+                pass  # Already committed, or the connection is gone (the server rolls back)
+        raise
+    finally:
+        for conn in conns:
+            await conn.close()
+
+def load_async(connect_kwargs: Dict[str, Any], streams: List[tuple], connections: int) -> Dict[str, int]:
+    """Load (table, columns, batches) streams with asyncpg binary COPY over several connections
+    
+    Batches pass through a bounded queue: the next batch is generated in a
+    worker thread while earlier ones are being copied, so generation and
+    server work overlap. Same transaction semantics as load_parallel: all
+    connections commit after the last batch, or all roll back on failure.
+    """
+    counts = {table: 0 for table, _, _ in streams}
+    started = {}
+    finished = {}
+    asyncio.run(_load_async(connect_kwargs, streams, connections, counts, started, finished))
+    
+    for table, _, _ in streams:
+        print(f"✓ Inserted {counts[table]} {table} rows into database over {connections} async connections")
+        report_rate(table, counts[table], started[table], finished.get(table))
+    return counts
+
+def cleanup_seeded_rows(conn, user_ids: List[str], class_ids: List[str]):
+    """Delete committed parent rows after a failed parallel load
+    
+    Teachers, students, grades and attendance cascade from users; courses
+    are removed with their classes.
+    """
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM courses WHERE class_id = ANY(%s::uuid[])", (class_ids,))
+    cursor.execute("DELETE FROM classes WHERE id = ANY(%s::uuid[])", (class_ids,))
+    cursor.execute("DELETE FROM users WHERE id = ANY(%s::uuid[])", (user_ids,))
+    cursor.close()
+    conn.commit()
+    print(f"🧹 Removed {len(user_ids)} seeded users and {len(class_ids)} classes")
+
+class FastLoad:
+    """Drop secondary indexes and disable user triggers for a bulk load, then put them back
+    
+    Only indexes that back no constraint (primary key, UNIQUE, exclusion,
+    foreign-key target) are dropped, so constraints stay enforced while
+    loading. Unique indexes declared without a constraint, such as
+    idx_unique_daily_attendance, are dropped too: duplicates surface when
+    restore() rebuilds them. restore() rebuilds the indexes over a pool of
+    connections, re-enables the triggers and runs ANALYZE; it is safe to call
+    again after a failure and only recreates what is still missing.
+    
+    What was dropped is recorded in the FAST_LOAD_STATE table in the same
+    transaction as the drops, so if the process dies before restore() the
+    next prepare() restores the leftovers first.
+    """
+    
+    def __init__(self, connect, tables: Sequence[str], connections: int = 1):
+        self.connect = connect
+        self.tables = list(tables)
+        self.connections = max(1, connections)
+        self.indexes = []   # (table, name, CREATE INDEX statement, comment, clustered)
+        self.triggers = []  # (table, name, pg_trigger.tgenabled)
+        self.timings = {}
+        self.load_started = None
+        self.restored = False
+    
+    def _phase(self, name: str, started: float):
+        self.timings[name] = time.perf_counter() - started
+        print(f"  ⏱  fast-load {name}: {self.timings[name]:.2f}s")
+    
+    def recover(self):
+        """Restore indexes and triggers an interrupted run left in FAST_LOAD_STATE"""
+        conn = self.connect()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT to_regclass(%s)", (FAST_LOAD_STATE,))
+            if cursor.fetchone()[0] is None:
+                return
+            cursor.execute(sql.SQL("""
+                SELECT table_name, name, statement, comment, clustered FROM {}
+                WHERE kind = 'index' ORDER BY table_name, name
+            """).format(sql.Identifier(FAST_LOAD_STATE)))
+            self.indexes = [tuple(row) for row in cursor.fetchall()]
+            cursor.execute(sql.SQL("""
+                SELECT table_name, name, enabled FROM {}
+                WHERE kind = 'trigger' ORDER BY table_name, name
+            """).format(sql.Identifier(FAST_LOAD_STATE)))
+            self.triggers = [tuple(row) for row in cursor.fetchall()]
+            cursor.close()
+        finally:
+            conn.close()
+        
+        print(f"⚠ Restoring {len(self.indexes)} indexes and {len(self.triggers)} triggers "
+              "left dropped by an interrupted --fast-load run")
+        self.restore()
+        self.restored = False
+        self.timings = {}
+    
+    def prepare(self):
+        """Record and drop secondary indexes, disable enabled user triggers (one transaction)"""
+        self.recover()
+        started = time.perf_counter()
+        conn = self.connect()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT c.relname, i.relname,
+                       pg_get_indexdef(i.oid) ||
+                           COALESCE(' TABLESPACE ' || quote_ident(ts.spcname), ''),
+                       obj_description(i.oid, 'pg_class'), x.indisclustered
+                FROM pg_index x
+                JOIN pg_class i ON i.oid = x.indexrelid
+                JOIN pg_class c ON c.oid = x.indrelid
+                LEFT JOIN pg_tablespace ts ON ts.oid = i.reltablespace
+                WHERE c.relnamespace = current_schema()::regnamespace
+                  AND c.relname = ANY(%s)
+                  AND NOT EXISTS (SELECT 1 FROM pg_constraint k WHERE k.conindid = x.indexrelid)
+                ORDER BY c.relname, i.relname
+            """, (self.tables,))
+            indexes = cursor.fetchall()
+            cursor.execute("""
+                SELECT c.relname, t.tgname, t.tgenabled
+                FROM pg_trigger t
+                JOIN pg_class c ON c.oid = t.tgrelid
+                WHERE c.relnamespace = current_schema()::regnamespace
+                  AND c.relname = ANY(%s)
+                  AND NOT t.tgisinternal AND t.tgenabled <> 'D'
+                ORDER BY c.relname, t.tgname
+            """, (self.tables,))
+            triggers = cursor.fetchall()
+            
+            cursor.execute(sql.SQL("""
+                CREATE TABLE {} (
+                    kind TEXT NOT NULL,
+                    table_name TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    statement TEXT,
+                    comment TEXT,
+                    clustered BOOLEAN,
+                    enabled TEXT,
+                    PRIMARY KEY (kind, name)
+                )
+            """).format(sql.Identifier(FAST_LOAD_STATE)))
+            insert = sql.SQL("INSERT INTO {} VALUES (%s, %s, %s, %s, %s, %s, %s)").format(
+                sql.Identifier(FAST_LOAD_STATE))
+            for table, name, statement, comment, clustered in indexes:
+                cursor.execute(insert, ('index', table, name, statement, comment, clustered, None))
+            for table, name, enabled in triggers:
+                cursor.execute(insert, ('trigger', table, name, None, None, None, enabled))
+            
+            for _, name, _, _, _ in indexes:
+                cursor.execute(sql.SQL("DROP INDEX {}").format(sql.Identifier(name)))
+            for table, name, _ in triggers:
+                cursor.execute(sql.SQL("ALTER TABLE {} DISABLE TRIGGER {}").format(
+                    sql.Identifier(table), sql.Identifier(name)))
+            cursor.close()
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        
+        self.indexes, self.triggers = indexes, triggers
+        print(f"⚡ Fast load: dropped {len(indexes)} indexes, disabled {len(triggers)} triggers")
+        self._phase('drop', started)
+        self.load_started = time.perf_counter()
+    
+    def _rebuild_indexes(self):
+        """Recreate dropped indexes, largest tables first, one per connection at a time"""
+        todo = queue.Queue()
+        for index in sorted(self.indexes, key=lambda ix: self.tables.index(ix[0]), reverse=True):
+            todo.put(index)
+        done = []
+        errors = []
+        lock = threading.Lock()
+        
+        def worker():
+            conn = self.connect()
+            try:
+                cursor = conn.cursor()
+                while not errors:
+                    try:
+                        table, name, statement, comment, clustered = index = todo.get_nowait()
+                    except queue.Empty:
+                        return
+                    try:
+                        cursor.execute(statement)
+                        if comment is not None:
+                            cursor.execute(sql.SQL("COMMENT ON INDEX {} IS %s").format(sql.Identifier(name)),
+                                           (comment,))
+                        if clustered:
+                            cursor.execute(sql.SQL("ALTER TABLE {} CLUSTER ON {}").format(
+                                sql.Identifier(table), sql.Identifier(name)))
+                        cursor.execute(sql.SQL("DELETE FROM {} WHERE kind = 'index' AND name = %s").format(
+                            sql.Identifier(FAST_LOAD_STATE)), (name,))
+                        conn.commit()
+                    except Exception as e:
+                        conn.rollback()
+                        errors.append(e)
+                        return
+                    with lock:
+                        done.append(index)
+            finally:
+                conn.close()
+        
+        threads = [threading.Thread(target=worker, daemon=True)
+                   for _ in range(min(self.connections, len(self.indexes)))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.indexes = [index for index in self.indexes if index not in done]
+        if errors:
+            raise errors[0]
+    
+    def restore(self):
+        """Rebuild indexes, re-enable triggers and ANALYZE the loaded tables"""
+        if self.restored:
+            return
+        if self.load_started is not None:
+            self._phase('load', self.load_started)
+            self.load_started = None
+        
+        if self.indexes:
+            started = time.perf_counter()
+            count = len(self.indexes)
+            self._rebuild_indexes()
+            print(f"✓ Rebuilt {count} indexes over {min(self.connections, count)} connections")
+            self._phase('rebuild indexes', started)
+        
+        started = time.perf_counter()
+        conn = self.connect()
+        try:
+            cursor = conn.cursor()
+            for table, name, enabled in self.triggers:
+                cursor.execute(sql.SQL(TRIGGER_ENABLE[enabled]).format(sql.Identifier(table), sql.Identifier(name)))
+            # Every index is back, so the state goes in the same transaction as the last triggers
+            cursor.execute(sql.SQL("DROP TABLE IF EXISTS {}").format(sql.Identifier(FAST_LOAD_STATE)))
+            conn.commit()
+            self.triggers = []
+            self._phase('enable triggers', started)
+            
+            conn.autocommit = True
+            
+            started = time.perf_counter()
+            for table in self.tables:
+                cursor.execute(sql.SQL("ANALYZE {}").format(sql.Identifier(table)))
+            self._phase('analyze', started)
+            cursor.close()
+        finally:
+            conn.close()
+        self.restored = True
+    
+    def finish(self):
+        """restore() if a failed run skipped it; print the remaining DDL if that fails too"""
+        try:
+            self.restore()
+        except Exception as e:
+            print(f"\n❌ Could not restore indexes/triggers: {e}")
+            print(f"   The next --fast-load run restores them from {FAST_LOAD_STATE}, or run these statements:")
+            for _, _, statement, _, _ in self.indexes:
+                print(f"   {statement};")
+            for table, name, enabled in self.triggers:
+                print(f"   {TRIGGER_ENABLE[enabled].format(table, name)};")
+
+class Checkpoint:
+    """Commit a seed in chunks and record progress in a JSON state file for --resume
+    
+    The state holds the row-shaping settings, the date all relative dates were
+    computed from and, per table, the batches and rows committed so far. Batches
+    are deterministic for given settings, so a resumed run regenerates each
+    stream and skips the rows already in the database. The state file is
+    written after each database commit, so a resume first reconciles it with
+    the rows the seed actually has committed.
+    """
+    
+    def __init__(self, path: str, settings: Dict[str, Any], every: int = CHECKPOINT_EVERY):
+        self.path = path
+        self.every = every
+        self.state = {'settings': settings, 'today': date.today().isoformat(), 'tables': {}}
+        self.resumed = {}  # table -> rows committed by earlier runs
+    
+    @property
+    def today(self) -> date:
+        return date.fromisoformat(self.state['today'])
+    
+    def resume(self):
+        """Adopt the saved state; raise ValueError if it was written with other settings"""
+        with open(self.path, encoding='utf-8') as f:
+            state = json.load(f)
+        changed = [
+            f"--{key.replace('_', '-')} {state['settings'].get(key)} (now {value})"
+            for key, value in self.state['settings'].items()
+            if state['settings'].get(key) != value
+        ]
+        if changed:
+            raise ValueError(f"{self.path} was written with different settings: {', '.join(changed)}")
+        self.state = state
+        self.resumed = {table: done['rows'] for table, done in state['tables'].items()}
+        print(f"✓ Resuming from {self.path} (started {self.state['today']}): " + ', '.join(
+            f"{table} {done['rows']} rows" + ('' if done['complete'] else f" ({done['batches']} batches)")
+            for table, done in state['tables'].items()
+        ))
+    
+    def complete(self, table: str) -> bool:
+        return self.state['tables'].get(table, {}).get('complete', False)
+    
+    def reconcile(self, conn, student_ids: List[str], parents: Dict[str, int]):
+        """Correct the resumed state with the rows committed for this seed's students
+        
+        A crash between a database commit and the state file write leaves the
+        file a chunk behind; without this the resumed run would load that chunk
+        again. parents holds {table: rows} for the tables committed together
+        with the students.
+        """
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM students WHERE id = ANY(%s::uuid[])", (student_ids,))
+        committed = cursor.fetchone()[0] == len(student_ids)
+        if committed != self.complete('courses'):
+            print(f"⚠ {self.path} is behind the database: parent tables are "
+                  + ("committed" if committed else "not committed"))
+            for table, rows in parents.items():
+                self.state['tables'][table] = {'batches': 1, 'rows': rows, 'complete': committed}
+        
+        for table in ('grades', 'attendance'):
+            cursor.execute(sql.SQL("SELECT COUNT(*) FROM {} WHERE student_id = ANY(%s::uuid[])").format(
+                sql.Identifier(table)), (student_ids,))
+            rows = cursor.fetchone()[0]
+            done = self.state['tables'].get(table, {'batches': 0, 'rows': 0, 'complete': False})
+            if rows != done['rows']:
+                print(f"⚠ {self.path} recorded {done['rows']} {table} rows but {rows} are committed; "
+                      "resuming from the database")
+                self.state['tables'][table] = {'batches': done['batches'], 'rows': rows, 'complete': False}
+        cursor.close()
+        self.resumed = {table: done['rows'] for table, done in self.state['tables'].items()}
+        self.save()
+    
+    def commit(self, conn, counts: Dict[str, tuple], complete: bool = False):
+        """Commit conn, then record {table: (batches, rows)} as durable"""
+        conn.commit()
+        for table, (batches, rows) in counts.items():
+            self.state['tables'][table] = {'batches': batches, 'rows': rows, 'complete': complete}
+        self.save()
+    
+    def save(self):
+        """Write the state file"""
+        # Write-then-rename so a crash never leaves a truncated state file
+        with open(self.path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(self.path + '.tmp', self.path)
+    
+    def batches(self, conn, table: str, batches: Iterable[Any]) -> Iterator[Any]:
+        """Pass batches through, skipping committed ones and committing every `every` loaded batches
+        
+        Control only returns here once the consumer has loaded the previous
+        batch, so each commit covers exactly the batches yielded so far.
+        Committed batches are skipped by row count, which always ends on a
+        batch boundary, so a reconciled state needs no batch count.
+        """
+        done = self.state['tables'].get(table, {'batches': 0, 'rows': 0, 'complete': False})
+        count, rows = 0, 0
+        if done['complete']:
+            print(f"⏭ Skipping {table}: all {done['rows']} rows already committed")
+            return
+        if done['rows']:
+            print(f"⏭ Skipping committed {table} batches ({done['rows']} rows)")
+        
+        for batch in batches:
+            count += 1
+            rows += batch_len(batch)
+            if rows <= done['rows']:
+                continue
+            yield batch
+            if count % self.every == 0:
+                self.commit(conn, {table: (count, rows)})
+        
+        self.commit(conn, {table: (count, rows)}, complete=True)
+    
+    def remove(self):
+        """Delete the state file once the whole seed is committed"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        print(f"✓ Seed complete, removed checkpoint {self.path}")
+
+@instrumented
+def generate_admin_user(seed: int = DEFAULT_SEED) -> UserRow:
+    """Generate default admin user"""
+    return UserRow(
+        id=entity_uuid(seed, 'users', 'admin@school.edu.vn'),
+        email='admin@school.edu.vn',
+        password_hash=DEFAULT_PASSWORD_HASH,
+        role='admin',
+        is_active=True
+    )
+
+@instrumented
+def generate_users(role: str, count: int, seed: int = DEFAULT_SEED, first: int = 0) -> List[UserRow]:
+    """Generate the <role>N@school.edu.vn login accounts first+1..count
+    
+    Accounts depend only on role and index, so they are built here rather than
+    carried inside every teacher/student record.
+    """
+    users = []
+    for i in range(first, count):
+        email = f"{role}{i+1}@school.edu.vn"
+        users.append(UserRow(entity_uuid(seed, 'users', email), email, DEFAULT_PASSWORD_HASH, role, True))
+    
+    print(f"✓ Generated {len(users)} {role} accounts")
+    return users
+
+@instrumented
+def generate_teachers(count: int, seed: int = DEFAULT_SEED, first: int = 0) -> List[TeacherRow]:
+    """Generate teacher records (teachers first..count-1); accounts come from generate_users"""
+    teachers = []
+    
+    for i in range(count):
+        first_name = fake.first_name()
+        last_name = fake.last_name()
+        
+        teacher = TeacherRow(
+            id=entity_uuid(seed, 'teachers', i + 1),
+            user_id=entity_uuid(seed, 'users', f"teacher{i+1}@school.edu.vn"),
+            first_name=first_name,
+            last_name=last_name,
+            department=random.choice(DEPARTMENTS),
+            phone=fake.phone_number()[:20],  # Limit to 20 chars
+            hire_date=fake.date_between(start_date='-10y', end_date='today')
+        )
+        
+        # Earlier teachers are still drawn so later ones match a full run
+        if i >= first:
+            teachers.append(teacher)
+    
+    print(f"✓ Generated {len(teachers)} teachers")
+    return teachers
+
+@instrumented
+def generate_classes(teacher_count: int, seed: int = DEFAULT_SEED, years: int = 1,
+                     student_count: int = 0) -> List[ClassRow]:
+    """Generate class records for every school, for the current and `years - 1` earlier academic years
+    
+    Each grade gets SECTIONS_PER_GRADE sections per school, or more when
+    student_count students spread evenly over schools and grades would not
+    fit at CLASS_MAX_STUDENTS per class. Each year, homeroom teachers are
+    dealt from a shuffled list of the teacher_count teachers, so nobody has
+    two homerooms while a teacher is still without one.
+    """
+    classes = []
+    schools = range(1, SCHOOLS + 1)
+    sections = {(school, grade): random.randint(*SECTIONS_PER_GRADE) for school in schools for grade in GRADE_LEVELS}
+    needed = -(-student_count // (SCHOOLS * len(GRADE_LEVELS) * CLASS_MAX_STUDENTS))  # ceil
+    sections = {key: max(count, needed) for key, count in sections.items()}
+    
+    for year in range(CURRENT_ACADEMIC_YEAR, CURRENT_ACADEMIC_YEAR - years, -1):
+        homerooms = random.sample(range(teacher_count), teacher_count)
+        first = len(classes)
+        for school in schools:
+            prefix = f"S{school:03d}-" if SCHOOLS > 1 else ''
+            for grade in GRADE_LEVELS:
+                for section in range(1, sections[school, grade] + 1):
+                    classes.append(ClassRow(
+                        id=entity_uuid(seed, 'classes', len(classes) + 1),
+                        name=f"{prefix}{grade}A{section}",
+                        grade_level=grade,
+                        academic_year=year,
+                        teacher_id=entity_uuid(seed, 'teachers', homerooms[(len(classes) - first) % teacher_count] + 1)
+                                   if teacher_count else None,
+                        room_number=f"{grade}{section:02d}",
+                        max_students=CLASS_MAX_STUDENTS
+                    ))
+    
+    print(f"✓ Generated {len(classes)} classes")
+    return classes
+
+def _student_shard(seed: int, shard: int, start: int, stop: int) -> List[StudentRow]:
+    """Generate students start..stop-1 with the shard's derived seed"""
+    seed_generators(seed, 'students', shard)
+    students = []
+    
+    for i in range(start, stop):
+        first_name = fake.first_name()
+        last_name = fake.last_name()
+        age = random.randint(10, 18)
+        dob = fake.date_of_birth(minimum_age=age, maximum_age=age)
+        
+        students.append(StudentRow(
+            id=entity_uuid(seed, 'students', i + 1),
+            user_id=entity_uuid(seed, 'users', f"student{i+1}@school.edu.vn"),
+            first_name=first_name,
+            last_name=last_name,
+            date_of_birth=dob,
+            gender=random.choice(['M', 'F']),
+            class_id=None,
+            phone=fake.phone_number()[:20] if random.random() > 0.3 else None,
+            address=fake.address() if random.random() > 0.2 else None,
+            parent_name=fake.name(),
+            parent_phone=fake.phone_number()[:20],
+            parent_email=fake.email() if random.random() > 0.3 else None
+        ))
+    
+    return students
+
+@instrumented
+def generate_students(count: int, seed: int = DEFAULT_SEED, workers: int = 1,
+                      first: int = 0) -> List[StudentRow]:
+    """Generate student records (students first..count-1); accounts come from generate_users"""
+    students = []
+    
+    # Only shards holding new students are generated; the shard containing
+    # `first` is generated whole so its students match a full run
+    skipped = first // SHARD_SIZE * SHARD_SIZE
+    tasks = ((seed,) + shard for shard in iter_shards(count) if shard[2] > first)
+    for shard_students in map_shards(_student_shard, tasks, workers):
+        students.extend(shard_students)
+    students = students[first - skipped:] if first > skipped else students
+    
+    print(f"✓ Generated {len(students)} students")
+    return students
+
+@instrumented
+def insert_users(conn, users: List[UserRow], loader: str = 'insert') -> int:
+    """Insert users and return the row count"""
+    count = load_rows(conn, 'users', UserRow._fields, users, loader)
+    
+    print(f"✓ Inserted {count} users into {target_name(conn)}")
+    return count
+
+@instrumented
+def insert_teachers(conn, teachers: List[TeacherRow], loader: str = 'insert') -> List[str]:
+    """Insert teachers and return list of teacher IDs"""
+    count = load_rows(conn, 'teachers', TeacherRow._fields, teachers, loader)
+    
+    print(f"✓ Inserted {count} teachers into {target_name(conn)}")
+    return [t.id for t in teachers]
+
+def assign_classes(students: List[StudentRow], class_ids: List[str]):
+    """Set each student's class_id in place: consecutive students fill classes in balanced blocks
+    
+    Block sizes differ by at most one, so classes generated for student_count
+    students stay within max_students.
+    """
+    count, n_classes = len(students), len(class_ids)
+    for i, s in enumerate(students):
+        students[i] = s._replace(class_id=class_ids[i * n_classes // count])
+
+def assign_free_seats(students: List[StudentRow], free_seats: Dict[str, int]):
+    """Set each student's class_id in place, always to the class with the most free seats left
+    
+    Used by --append: classes fill up evenly and none goes past its free
+    seats. The caller makes sure there are enough seats for all students.
+    """
+    heap = [(-free, order, class_id) for order, (class_id, free) in enumerate(free_seats.items()) if free > 0]
+    heapq.heapify(heap)
+    for i, s in enumerate(students):
+        free, order, class_id = heapq.heappop(heap)
+        students[i] = s._replace(class_id=class_id)
+        if free < -1:
+            heapq.heappush(heap, (free + 1, order, class_id))
+
+@instrumented
+def insert_classes(conn, classes: List[ClassRow], loader: str = 'insert') -> List[str]:
+    """Insert classes and return list of class IDs"""
+    count = load_rows(conn, 'classes', ClassRow._fields, classes, loader)
+    
+    print(f"✓ Inserted {count} classes into {target_name(conn)}")
+    return [c.id for c in classes]
+
+@instrumented
+def insert_students(conn, students: List[StudentRow], loader: str = 'insert') -> List[str]:
+    """Insert students and return list of student IDs"""
+    count = load_rows(conn, 'students', StudentRow._fields, students, loader)
+    
+    print(f"✓ Inserted {count} students into {target_name(conn)}")
+    return [s.id for s in students]
+
+def course_codes(seed: int, prefix: str) -> Iterator[str]:
+    """Unique codes for one subject: <prefix>100..999 in a seeded shuffled order, then <prefix>1000, 1001, ...
+    
+    Stops when the next code would not fit in courses.code; capacity_problems() rules that out up front.
+    """
+    suffixes = list(range(100, 1000))
+    random.Random(derive_seed(seed, 'course_codes', prefix)).shuffle(suffixes)
+    for suffix in chain(suffixes, range(1000, 10 ** (COURSE_CODE_LENGTH - len(prefix)))):
+        yield f"{prefix}{suffix}"
+
+@instrumented
+def generate_courses(class_ids: List[str], teacher_ids: List[str], seed: int = DEFAULT_SEED,
+                     class_years: Dict[str, int] = None, taken_codes: Iterable[str] = ()) -> List[CourseRow]:
+    """Generate course records (academic year per class from class_years, default current)
+    
+    Codes in taken_codes (already in the database, for --append) are skipped.
+    """
+    taken_codes = set(taken_codes)
+    courses = []
+    codes = {}  # subject code -> course_codes() iterator; codes are unique across classes and years
+    
+    for class_id in class_ids:
+        num_subjects = random.randint(8, len(SUBJECTS))
+        selected_subjects = random.sample(SUBJECTS, num_subjects)
+        
+        for semester in [1, 2]:
+            for code_prefix, name in selected_subjects:
+                if code_prefix not in codes:
+                    codes[code_prefix] = (code for code in course_codes(seed, code_prefix) if code not in taken_codes)
+                
+                courses.append(CourseRow(
+                    id=entity_uuid(seed, 'courses', len(courses) + 1),
+                    name=name,
+                    code=next(codes[code_prefix]),
+                    description=f"{name} - Semester {semester}",
+                    teacher_id=random.choice(teacher_ids),
+                    class_id=class_id,
+                    semester=semester,
+                    academic_year=(class_years or {}).get(class_id, CURRENT_ACADEMIC_YEAR),
+                    credits=random.choice([1, 2, 3])
+                ))
+    
+    print(f"✓ Generated {len(courses)} courses")
+    return courses
+
+@instrumented
+def insert_courses(conn, courses: List[CourseRow], loader: str = 'insert') -> List[str]:
+    """Insert courses and return list of course IDs"""
+    count = load_rows(conn, 'courses', CourseRow._fields, courses, loader)
+    
+    print(f"✓ Inserted {count} courses into {target_name(conn)}")
+    return [c.id for c in courses]
+
+def _grade_shard(seed: int, shard: int, student_ids: List[str], course_ids: List[str], today: date) -> List[tuple]:
+    """Generate GRADE_COLUMNS tuples for one shard of students (exam dates relative to today)"""
+    seed_generators(seed, 'grades', shard)
+    rows = []
+    
+    for student_id in student_ids:
+        num_courses = random.randint(8, min(10, len(course_ids)))
+        student_courses = random.sample(course_ids, num_courses)
+        
+        for course_id in student_courses:
+            base_grade = random.uniform(5.0, 9.5)
+            
+            for exam_type, weight in EXAM_TYPES.items():
+                grade_value = max(0, min(10, base_grade + random.uniform(-1.5, 1.5)))
+                low, high = EXAM_WINDOWS[exam_type]
+                exam_date = fake.date_between(start_date=today + timedelta(days=low),
+                                              end_date=today + timedelta(days=high))
+                
+                rows.append((
+                    student_id,
+                    course_id,
+                    round(grade_value, 2),
+                    exam_type,
+                    exam_date,
+                    weight,
+                    fake.sentence() if random.random() > 0.8 else None
+                ))
+    
+    return rows
+
+@lru_cache(maxsize=4)
+def _note_pool(seed: int) -> 'np.ndarray':
+    """Seeded pool of Faker sentences sampled by the numpy engine"""
+    if isinstance(fake, PooledFaker):
+        return np.array(fake.pools['sentence'], dtype=object)
+    pool_faker = Faker('en_US')
+    pool_faker.seed_instance(derive_seed(seed, 'notes'))
+    return np.array([pool_faker.sentence() for _ in range(NOTE_POOL_SIZE)], dtype=object)
+
+def _distinct_picks(rng, rows: int, population: int, k: int) -> Any:
+    """Draw k distinct indices below population for each of rows rows
+    
+    Redraws only the rows that came out with a duplicate, so memory stays
+    O(rows * k) however many courses there are. Small populations, where
+    duplicates are likely, use random ranks over the (small) full matrix.
+    """
+    if population <= DISTINCT_RANK_LIMIT:
+        return np.argsort(rng.random((rows, population)), axis=1)[:, :k]
+    
+    picks = rng.integers(0, population, size=(rows, k))
+    redraw = np.arange(rows)
+    while len(redraw):
+        ordered = np.sort(picks[redraw], axis=1)
+        redraw = redraw[(ordered[:, 1:] == ordered[:, :-1]).any(axis=1)]
+        picks[redraw] = rng.integers(0, population, size=(len(redraw), k))
+    return picks
+
+def _grade_shard_numpy(seed: int, shard: int, student_ids: List[str], course_ids: List[str],
+                       today: date) -> Dict[str, Any]:
+    """Generate GRADE_COLUMNS arrays for one shard of students in a vectorized pass"""
+    rng = np.random.default_rng(derive_seed(seed, 'grades', shard))
+    exam_types = list(EXAM_TYPES)
+    n_students, n_courses, n_exams = len(student_ids), len(course_ids), len(exam_types)
+    
+    # Sample 8..10 distinct courses per student, keep the first k
+    max_courses = min(10, n_courses)
+    k = rng.integers(min(8, max_courses), max_courses + 1, size=n_students)
+    picks = _distinct_picks(rng, n_students, n_courses, max_courses)
+    taken = np.arange(max_courses) < k[:, None]
+    pair_student = np.broadcast_to(np.arange(n_students)[:, None], picks.shape)[taken]
+    pair_course = picks[taken]
+    
+    # One base grade per (student, course), one row per exam type
+    base = rng.uniform(5.0, 9.5, size=len(pair_course))
+    n_rows = len(pair_course) * n_exams
+    grades = np.clip(np.repeat(base, n_exams) + rng.uniform(-1.5, 1.5, size=n_rows), 0, 10).round(2)
+    type_index = np.tile(np.arange(n_exams), len(pair_course))
+    
+    low = np.array([EXAM_WINDOWS[t][0] for t in exam_types])[type_index]
+    high = np.array([EXAM_WINDOWS[t][1] for t in exam_types])[type_index]
+    exam_dates = np.datetime64(today, 'D') + rng.integers(low, high + 1)
+    
+    notes = np.full(n_rows, None, dtype=object)
+    has_note = rng.random(n_rows) > 0.8
+    pool = _note_pool(seed)
+    notes[has_note] = pool[rng.integers(0, len(pool), size=int(has_note.sum()))]
+    
+    return {
+        'student_id': np.repeat(np.array(student_ids, dtype=object)[pair_student], n_exams),
+        'course_id': np.repeat(np.array(course_ids, dtype=object)[pair_course], n_exams),
+        'grade': grades,
+        'exam_type': np.array(exam_types, dtype=object)[type_index],
+        'exam_date': exam_dates,
+        'weight': np.array(list(EXAM_TYPES.values()))[type_index],
+        'notes': notes
+    }
+
+@instrumented
+def generate_grades(student_ids: List[str], course_ids: List[str], count: int,
+                    batch_size: int = BATCH_SIZE, seed: int = DEFAULT_SEED,
+                    workers: int = 1, engine: str = 'python', today: date = None) -> Iterator[Any]:
+    """Generate grade records as batches of GRADE_COLUMNS tuples (or column arrays with numpy)
+    
+    Exam dates fall in EXAM_WINDOWS relative to today (default: the current date).
+    """
+    total = 0
+    shard_fn = _grade_shard_numpy if engine == 'numpy' else _grade_shard
+    today = today or date.today()
+    tasks = (
+        (seed, shard, student_ids[start:stop], course_ids, today)
+        for shard, start, stop in iter_shards(len(student_ids), rows_shard_size(10 * len(EXAM_TYPES)))
+    )
+    
+    for rows in map_shards(shard_fn, tasks, workers):
+        n_rows = min(batch_len(rows), count - total)
+        for i in range(0, n_rows, batch_size):
+            yield slice_batch(rows, i, min(i + batch_size, n_rows))
+        total += n_rows
+        
+        if total >= count:
+            break
+    
+    print(f"✓ Generated {total} grades")
+
+@instrumented
+def insert_grades(conn, batches: Iterable[Any], loader: str = 'insert') -> int:
+    """Insert grade batches as they are generated and return the row count"""
+    started = time.perf_counter()
+    total = 0
+    
+    for batch in batches:
+        total += load_batch(conn, 'grades', GRADE_COLUMNS, batch, loader)
+    
+    print(f"✓ Inserted {total} grades into {target_name(conn)}")
+    report_rate('grades', total, started)
+    return total
+
+def _attendance_shard(seed: int, shard: int, student_ids: List[str], start_date: datetime, days: int) -> List[tuple]:
+    """Generate ATTENDANCE_COLUMNS tuples for one shard of students"""
+    seed_generators(seed, 'attendance', shard)
+    rows = []
+    
+    for student_id in student_ids:
+        for day in range(days):
+            date = start_date + timedelta(days=day)
+            if date.weekday() in [5, 6]:
+                continue
+            
+            if random.random() < 0.1:
+                continue
+            
+            status = random.choices(ATTENDANCE_STATUSES, weights=ATTENDANCE_WEIGHTS)[0]
+            
+            rows.append((
+                student_id,
+                None,
+                date.date(),
+                status,
+                fake.sentence() if status != 'present' and random.random() > 0.7 else None
+            ))
+    
+    return rows
+
+def _attendance_shard_numpy(seed: int, shard: int, student_ids: List[str], start_date: datetime,
+                            days: int) -> Dict[str, Any]:
+    """Generate ATTENDANCE_COLUMNS arrays for one shard of students in a vectorized pass"""
+    rng = np.random.default_rng(derive_seed(seed, 'attendance', shard))
+    
+    offsets = np.arange(days)
+    # 1970-01-01 was a Thursday, so (epoch day + 3) % 7 is the weekday with Monday = 0
+    epoch_day = np.datetime64(start_date.date(), 'D').astype(np.int64)
+    offsets = offsets[~np.isin((epoch_day + offsets + 3) % 7, [5, 6])]
+    shape = (len(student_ids), len(offsets))
+    
+    # Same masks as the python engine: weekends dropped, then ~10% of days skipped
+    kept = rng.random(shape) >= 0.1
+    weights = np.array(ATTENDANCE_WEIGHTS) / sum(ATTENDANCE_WEIGHTS)
+    status_codes = rng.choice(len(ATTENDANCE_STATUSES), size=shape, p=weights)[kept]
+    n_rows = len(status_codes)
+    
+    notes = np.full(n_rows, None, dtype=object)
+    has_note = (status_codes != 0) & (rng.random(n_rows) > 0.7)
+    pool = _note_pool(seed)
+    notes[has_note] = pool[rng.integers(0, len(pool), size=int(has_note.sum()))]
+    
+    return {
+        'student_id': np.broadcast_to(np.array(student_ids, dtype=object)[:, None], shape)[kept],
+        'course_id': np.full(n_rows, None, dtype=object),
+        'date': np.datetime64(start_date.date(), 'D') + np.broadcast_to(offsets, shape)[kept],
+        'status': np.array(ATTENDANCE_STATUSES, dtype=object)[status_codes],
+        'notes': notes
+    }
+
+@instrumented
+def generate_attendance(student_ids: List[str], days: int = 90, batch_size: int = BATCH_SIZE,
+                        seed: int = DEFAULT_SEED, workers: int = 1, engine: str = 'python',
+                        start_date: datetime = None) -> Iterator[Any]:
+    """Generate attendance records as batches of ATTENDANCE_COLUMNS tuples (or column arrays with numpy)
+    
+    Covers `days` days from start_date (default: the `days` days before today).
+    """
+    total = 0
+    shard_fn = _attendance_shard_numpy if engine == 'numpy' else _attendance_shard
+    if start_date is None:
+        start_date = datetime.now() - timedelta(days=days)
+    tasks = (
+        (seed, shard, student_ids[start:stop], start_date, days)
+        for shard, start, stop in iter_shards(len(student_ids), rows_shard_size(days))
+    )
+    
+    for rows in map_shards(shard_fn, tasks, workers):
+        n_rows = batch_len(rows)
+        for i in range(0, n_rows, batch_size):
+            yield slice_batch(rows, i, i + batch_size)
+        total += n_rows
+    
+    print(f"✓ Generated {total} attendance records")
+
+@instrumented
+def insert_attendance(conn, batches: Iterable[Any], loader: str = 'insert') -> int:
+    """Insert attendance batches as they are generated and return the row count"""
+    started = time.perf_counter()
+    total = 0
+    
+    for batch in batches:
+        total += load_batch(conn, 'attendance', ATTENDANCE_COLUMNS, batch, loader)
+    
+    print(f"✓ Inserted {total} attendance records into {target_name(conn)}")
+    report_rate('attendance', total, started)
+    return total
+
+class Rollups:
+    """Aggregates for the ROLLUPS tables, tallied from grade/attendance batches as they stream by
+    
+    Grades and weights are summed as integer hundredths, so the rollups match
+    the NUMERIC sums of the raw-scan views exactly.
+    """
+    
+    def __init__(self, class_ids: Dict[str, str]):
+        self.class_ids = class_ids  # student_id -> homeroom class_id
+        self.scores = {}     # (student_id, course_id) -> [grades, sum of weight*100, sum of grade*weight*10^4]
+        self.daily = {}      # (class_id, date) -> count per ATTENDANCE_STATUSES
+        self.histogram = {}  # (course_id, bucket) -> grades
+    
+    def grades(self, batches: Iterable[Any]) -> Iterator[Any]:
+        """Pass grade batches through, tallying scores and histograms"""
+        scores, histogram = self.scores, self.histogram
+        for batch in batches:
+            for student_id, course_id, grade, _, _, weight, _ in batch_rows(batch, GRADE_COLUMNS):
+                grade, weight = round(grade * 100), round(weight * 100)
+                score = scores.get((student_id, course_id))
+                if score is None:
+                    score = scores[(student_id, course_id)] = [0, 0, 0]
+                score[0] += 1
+                score[1] += weight
+                score[2] += grade * weight
+                key = (course_id, grade // 100)
+                histogram[key] = histogram.get(key, 0) + 1
+            yield batch
+    
+    def attendance(self, batches: Iterable[Any]) -> Iterator[Any]:
+        """Pass attendance batches through, tallying statuses per class and day"""
+        daily, class_ids = self.daily, self.class_ids
+        status_index = {status: i for i, status in enumerate(ATTENDANCE_STATUSES)}
+        for batch in batches:
+            for student_id, _, day, status, _ in batch_rows(batch, ATTENDANCE_COLUMNS):
+                key = (class_ids[student_id], day)
+                counts = daily.get(key)
+                if counts is None:
+                    counts = daily[key] = [0] * len(ATTENDANCE_STATUSES)
+                counts[status_index[status]] += 1
+            yield batch
+    
+    def rows(self) -> Dict[str, List[tuple]]:
+        """Rollup rows keyed by table, in ROLLUPS column order"""
+        cent = Decimal('0.01')
+        scores = []
+        for (student_id, course_id), (count, weights, weighted) in self.scores.items():
+            weight_sum, weighted_sum = Decimal(weights) / 100, Decimal(weighted) / 10000
+            score = (weighted_sum / weight_sum).quantize(cent, ROUND_HALF_UP) if weights else None
+            scores.append((student_id, course_id, count, weight_sum, weighted_sum, score))
+        return {
+            'rollup_student_course_scores': scores,
+            'rollup_class_daily_attendance': [
+                (class_id, day, *counts, sum(counts)) for (class_id, day), counts in self.daily.items()
+            ],
+            'rollup_course_grade_histogram': [
+                (course_id, bucket, count) for (course_id, bucket), count in self.histogram.items()
+            ]
+        }
+
+@instrumented
+def insert_rollups(conn, rollups: Rollups, loader: str = 'insert') -> int:
+    """Bulk-load the tallied rollups and return the row count"""
+    total = 0
+    for table, rows in rollups.rows().items():
+        total += load_rows(conn, table, ROLLUPS[table][0], rows, 'copy' if loader == 'async' else loader)
+        print(f"✓ Inserted {len(rows)} {table} rows into {target_name(conn)}")
+    return total
+
+@instrumented
+def refresh_rollups(conn) -> int:
+    """Recompute every rollup table from its raw-scan view (for loads that were not tallied in full)"""
+    total = 0
+    cursor = conn.cursor()
+    for table, (columns, view) in ROLLUPS.items():
+        started = time.perf_counter()
+        column_list = sql.SQL(', ').join(map(sql.Identifier, columns))
+        cursor.execute(sql.SQL("TRUNCATE {}").format(sql.Identifier(table)))
+        cursor.execute(sql.SQL("INSERT INTO {} ({}) SELECT {} FROM {}").format(
+            sql.Identifier(table), column_list, column_list, sql.Identifier(view)))
+        total += cursor.rowcount
+        print(f"✓ Refreshed {cursor.rowcount} {table} rows from {view}")
+        report_rate(table, cursor.rowcount, started)
+    cursor.close()
+    return total
+
+def school_days(year: int, semester: int, until: date = None) -> List[date]:
+    """Mon-Fri teaching days of one semester of an academic year (optionally up to `until`)"""
+    (start_offset, start_month, start_day), (end_offset, end_month, end_day) = SEMESTER_DATES[semester]
+    day = date(year + start_offset, start_month, start_day)
+    end = date(year + end_offset, end_month, end_day)
+    if until is not None:
+        end = min(end, until)
+    
+    days = []
+    while day <= end:
+        if day.weekday() < 5:
+            days.append(day)
+        day += timedelta(days=1)
+    return days
+
+def plan_timeseries(classes: List[ClassRow], courses: List[CourseRow],
+                    students: List[StudentRow], seed: int = DEFAULT_SEED,
+                    periods_per_day: int = PERIODS_PER_DAY, today: date = None) -> List[tuple]:
+    """Lay out the school calendar for --workload timeseries
+    
+    Every class gets a weekly timetable per semester (courses repeat in
+    proportion to their credits) and an exam schedule from TIMESERIES_EXAMS.
+    Earlier academic years reuse today's students: a student now in class
+    gA<s> sat in (g-k)A<s> of the same school k years ago. Returns one (date, sessions) entry per
+    school day before today (default: the current date), in date order; a session is (student_ids,
+    abilities, course_id per period, exams that day as (course_id, exam_type,
+    weight, course_effect)).
+    """
+    rng = random.Random(derive_seed(seed, 'timeseries'))
+    until = (today or date.today()) - timedelta(days=1)
+    
+    by_key = {(c.academic_year, c.grade_level, c.name): c for c in classes}
+    current = {c.id: c for c in classes if c.academic_year == CURRENT_ACADEMIC_YEAR}
+    years = sorted({c.academic_year for c in classes})
+    
+    members = {c.id: ([], []) for c in classes}  # class_id -> (student_ids, abilities)
+    for s in students:
+        home = current[s.class_id]
+        section = home.name.split('A', 1)[1]
+        school = home.name[:-len(f"{home.grade_level}A{section}")]  # S<nnn>- prefix, if any
+        ability = rng.uniform(5.0, 9.5)
+        for year in years:
+            grade = home.grade_level - (CURRENT_ACADEMIC_YEAR - year)
+            past = by_key.get((year, grade, f"{school}{grade}A{section}"))
+            if past is not None:
+                members[past.id][0].append(s.id)
+                members[past.id][1].append(ability)
+    
+    class_courses = {}
+    for c in courses:
+        class_courses.setdefault((c.class_id, c.semester), []).append(c)
+    
+    # Sessions per (year, semester, weekday); exams keyed by (class_id, date)
+    days = []
+    for year in years:
+        for semester in [1, 2]:
+            calendar = school_days(year, semester)
+            if not calendar or calendar[0] > until:
+                continue
+            weekly = {weekday: [] for weekday in range(5)}
+            exams = {}
+            
+            for c in classes:
+                if c.academic_year != year or not members[c.id][0]:
+                    continue
+                semester_courses = class_courses.get((c.id, semester), [])
+                if not semester_courses:
+                    continue
+                
+                slots = [course.id for course in semester_courses for _ in range(course.credits)]
+                week = [slots[i % len(slots)] for i in range(5 * periods_per_day)]
+                rng.shuffle(week)
+                
+                for course in semester_courses:
+                    effect = rng.gauss(0, 0.5)
+                    for exam_type, (count, low, high) in TIMESERIES_EXAMS.items():
+                        first = int(low * len(calendar))
+                        last = max(first + 1, int(high * len(calendar)))
+                        for _ in range(count):
+                            exam_day = calendar[rng.randrange(first, last)]
+                            exams.setdefault((c.id, exam_day), []).append(
+                                (course.id, exam_type, EXAM_TYPES[exam_type], effect)
+                            )
+                
+                student_ids, abilities = members[c.id]
+                for weekday in range(5):
+                    weekly[weekday].append((
+                        c.id, tuple(student_ids), tuple(abilities),
+                        week[weekday * periods_per_day:(weekday + 1) * periods_per_day]
+                    ))
+            
+            for day in school_days(year, semester, until):
+                days.append((day, [
+                    (student_ids, abilities, periods, exams.get((class_id, day), []))
+                    for class_id, student_ids, abilities, periods in weekly[day.weekday()]
+                ]))
+    
+    print(f"✓ Planned {len(days)} school days over {len(years)} academic years "
+          f"({periods_per_day} periods/day)")
+    return days
+
+def _timeseries_attendance_shard(seed: int, day: date, part: int, sessions: List[tuple]) -> List[tuple]:
+    """Per-period ATTENDANCE_COLUMNS tuples for one part of a school day (see split_sessions)
+    
+    Each student gets one status for the day: absent/excused students miss
+    every period, late students are late for the first period only.
+    """
+    seed_generators(seed, 'timeseries-attendance', day.toordinal(), part)
+    rows = []
+    
+    for student_ids, _, periods, _ in sessions:
+        statuses = random.choices(ATTENDANCE_STATUSES, weights=ATTENDANCE_WEIGHTS, k=len(student_ids))
+        for period, course_id in enumerate(periods):
+            for student_id, status in zip(student_ids, statuses):
+                if status == 'late' and period > 0:
+                    status = 'present'
+                rows.append((
+                    student_id,
+                    course_id,
+                    day,
+                    status,
+                    fake.sentence() if status != 'present' and random.random() > 0.7 else None
+                ))
+    
+    return rows
+
+def _timeseries_attendance_shard_numpy(seed: int, day: date, part: int, sessions: List[tuple]) -> Dict[str, Any]:
+    """Per-period ATTENDANCE_COLUMNS arrays for one part of a school day (same rules as the python engine)"""
+    rng = np.random.default_rng(derive_seed(seed, 'timeseries-attendance', day.toordinal(), part))
+    weights = np.array(ATTENDANCE_WEIGHTS) / sum(ATTENDANCE_WEIGHTS)
+    late = ATTENDANCE_STATUSES.index('late')
+    student_cols, course_cols, status_cols = [], [], []
+    
+    for student_ids, _, periods, _ in sessions:
+        codes = rng.choice(len(ATTENDANCE_STATUSES), size=len(student_ids), p=weights)
+        by_period = np.tile(codes, (len(periods), 1))
+        by_period[1:][by_period[1:] == late] = 0
+        student_cols.append(np.tile(np.array(student_ids, dtype=object), len(periods)))
+        course_cols.append(np.repeat(np.array(periods, dtype=object), len(student_ids)))
+        status_cols.append(by_period.ravel())
+    
+    status_codes = np.concatenate(status_cols)
+    n_rows = len(status_codes)
+    notes = np.full(n_rows, None, dtype=object)
+    has_note = (status_codes != 0) & (rng.random(n_rows) > 0.7)
+    pool = _note_pool(seed)
+    notes[has_note] = pool[rng.integers(0, len(pool), size=int(has_note.sum()))]
+    
+    return {
+        'student_id': np.concatenate(student_cols),
+        'course_id': np.concatenate(course_cols),
+        'date': np.full(n_rows, np.datetime64(day, 'D')),
+        'status': np.array(ATTENDANCE_STATUSES, dtype=object)[status_codes],
+        'notes': notes
+    }
+
+def _timeseries_grade_shard(seed: int, day: date, part: int, sessions: List[tuple]) -> List[tuple]:
+    """GRADE_COLUMNS tuples for the exams held on one part of a school day"""
+    seed_generators(seed, 'timeseries-grades', day.toordinal(), part)
+    rows = []
+    
+    for student_ids, abilities, _, exams in sessions:
+        for course_id, exam_type, weight, effect in exams:
+            for student_id, ability in zip(student_ids, abilities):
+                grade_value = max(0, min(10, ability + effect + random.uniform(-1.5, 1.5)))
+                rows.append((
+                    student_id,
+                    course_id,
+                    round(grade_value, 2),
+                    exam_type,
+                    day,
+                    weight,
+                    fake.sentence() if random.random() > 0.8 else None
+                ))
+    
+    return rows
+
+def _timeseries_grade_shard_numpy(seed: int, day: date, part: int, sessions: List[tuple]) -> Dict[str, Any]:
+    """GRADE_COLUMNS arrays for the exams held on one part of a school day"""
+    rng = np.random.default_rng(derive_seed(seed, 'timeseries-grades', day.toordinal(), part))
+    student_cols, course_cols, grade_cols, type_cols, weight_cols = [], [], [], [], []
+    
+    for student_ids, abilities, _, exams in sessions:
+        for course_id, exam_type, weight, effect in exams:
+            n = len(student_ids)
+            student_cols.append(np.array(student_ids, dtype=object))
+            course_cols.append(np.full(n, course_id, dtype=object))
+            grade_cols.append(np.clip(np.array(abilities) + effect + rng.uniform(-1.5, 1.5, size=n), 0, 10).round(2))
+            type_cols.append(np.full(n, exam_type, dtype=object))
+            weight_cols.append(np.full(n, weight))
+    
+    grades = np.concatenate(grade_cols)
+    n_rows = len(grades)
+    notes = np.full(n_rows, None, dtype=object)
+    has_note = rng.random(n_rows) > 0.8
+    pool = _note_pool(seed)
+    notes[has_note] = pool[rng.integers(0, len(pool), size=int(has_note.sum()))]
+    
+    return {
+        'student_id': np.concatenate(student_cols),
+        'course_id': np.concatenate(course_cols),
+        'grade': grades,
+        'exam_type': np.concatenate(type_cols),
+        'exam_date': np.full(n_rows, np.datetime64(day, 'D')),
+        'weight': np.concatenate(weight_cols),
+        'notes': notes
+    }
+
+@instrumented
+def generate_timeseries_grades(plan: List[tuple], batch_size: int = BATCH_SIZE, seed: int = DEFAULT_SEED,
+                               workers: int = 1, engine: str = 'python') -> Iterator[Any]:
+    """Generate grades for every exam in the plan, in exam_date order"""
+    total = 0
+    shard_fn = _timeseries_grade_shard_numpy if engine == 'numpy' else _timeseries_grade_shard
+    tasks = (
+        (seed, day, part, sessions_part)
+        for day, sessions in plan
+        for part, sessions_part in enumerate(split_sessions(
+            [session for session in sessions if session[3]],
+            lambda session: len(session[0]) * len(session[3])
+        ))
+    )
+    
+    for rows in map_shards(shard_fn, tasks, workers):
+        n_rows = batch_len(rows)
+        for i in range(0, n_rows, batch_size):
+            yield slice_batch(rows, i, i + batch_size)
+        total += n_rows
+    
+    print(f"✓ Generated {total} grades")
+
+@instrumented
+def generate_timeseries_attendance(plan: List[tuple], batch_size: int = BATCH_SIZE, seed: int = DEFAULT_SEED,
+                                   workers: int = 1, engine: str = 'python') -> Iterator[Any]:
+    """Generate per-period attendance for every school day in the plan, in date order"""
+    total = 0
+    shard_fn = _timeseries_attendance_shard_numpy if engine == 'numpy' else _timeseries_attendance_shard
+    tasks = (
+        (seed, day, part, sessions_part)
+        for day, sessions in plan
+        for part, sessions_part in enumerate(split_sessions(sessions, lambda session: len(session[0]) * len(session[2])))
+    )
+    
+    for rows in map_shards(shard_fn, tasks, workers):
+        n_rows = batch_len(rows)
+        for i in range(0, n_rows, batch_size):
+            yield slice_batch(rows, i, i + batch_size)
+        total += n_rows
+    
+    print(f"✓ Generated {total} attendance records")
 
-def generate_admin_user() -> Dict[str, Any]:
-    """Generate default admin user"""
+def connect_db(args):
+    """Open a non-autocommit connection from the --host/--port/... arguments"""
+    conn = psycopg2.connect(
+        host=args.host,
+        port=args.port,
+        dbname=args.dbname,
+        user=args.user,
+        password=args.password
+    )
+    conn.autocommit = False
+    return conn
+
+def read_high_water_marks(conn) -> Dict[str, Any]:
+    """Read what an earlier run already seeded, for --append
+    
+    Returns the highest teacherN/studentN email index, whether the admin
+    exists, the latest attendance date, the existing teacher and student
+    IDs, the current academic year's class and course IDs, each current
+    class's name and free seats, and every course code in use.
+    """
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT COALESCE(MAX(substring(email FROM '^teacher([0-9]+)@school[.]edu[.]vn$')::int), 0),
+               COALESCE(MAX(substring(email FROM '^student([0-9]+)@school[.]edu[.]vn$')::int), 0),
+               COALESCE(bool_or(email = 'admin@school.edu.vn'), false)
+        FROM users
+    """)
+    teachers, students, admin = cursor.fetchone()
+    cursor.execute("SELECT MAX(date) FROM attendance")
+    attendance_until = cursor.fetchone()[0]
+    
+    ids = {}
+    for table in ['teachers', 'students']:
+        cursor.execute(f"SELECT id::text FROM {table} ORDER BY id")
+        ids[table] = [row[0] for row in cursor.fetchall()]
+    cursor.execute("SELECT id::text FROM courses WHERE academic_year = %s ORDER BY id", (CURRENT_ACADEMIC_YEAR,))
+    ids['courses'] = [row[0] for row in cursor.fetchall()]
+    cursor.execute("""
+        SELECT c.id::text, c.name, COALESCE(c.max_students, %s), COUNT(s.id)
+        FROM classes c
+        LEFT JOIN students s ON s.class_id = c.id
+        WHERE c.academic_year = %s
+        GROUP BY c.id
+        ORDER BY c.id
+    """, (CLASS_MAX_STUDENTS, CURRENT_ACADEMIC_YEAR))
+    classes = cursor.fetchall()
+    cursor.execute("SELECT code FROM courses")
+    course_codes = {row[0] for row in cursor.fetchall()}
+    cursor.close()
+    conn.rollback()
+    
+    print(f"✓ High-water marks: teacher{teachers}, student{students}, "
+          f"attendance through {attendance_until or 'none'}")
     return {
-        'email': 'admin@school.edu.vn',
-        'password_hash': '$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LewY5GyYIQn8Qzp.2',
-        'role': 'admin',
-        'is_active': True
+        'teachers': teachers,
+        'students': students,
+        'admin': admin,
+        'attendance_until': attendance_until,
+        'teacher_ids': ids['teachers'],
+        'class_ids': [class_id for class_id, _, _, _ in classes],
+        'class_names': {name for _, name, _, _ in classes},
+        'free_seats': {class_id: max(0, seats - enrolled) for class_id, _, seats, enrolled in classes},
+        'enrolled': sum(enrolled for _, _, _, enrolled in classes),
+        'student_ids': ids['students'],
+        'course_ids': ids['courses'],
+        'course_codes': course_codes
     }
 
-def generate_teachers(count: int) -> List[Dict[str, Any]]:
-    """Generate teacher records with associated user accounts"""
-    teachers = []
+def load_dataset_main(args):
+    """--from-dataset: stream a previously exported dataset into the database with COPY"""
+    print("=" * 60)
+    print("AI SCHOOL DASHBOARD - DATASET LOADER")
+    print("=" * 60)
     
-    for i in range(count):
-        first_name = fake.first_name()
-        last_name = fake.last_name()
-        email = f"teacher{i+1}@school.edu.vn"
+    with open(os.path.join(args.from_dataset, 'manifest.json'), encoding='utf-8') as f:
+        fmt = json.load(f)['format']
+    if fmt in COLUMNAR_FORMATS and pa is None:
+        print(f"Error: loading a {fmt} dataset requires pyarrow")
+        print("Install with: pip install pyarrow")
+        sys.exit(1)
+    
+    conn = None
+    fast_load = None
+    try:
+        print("\n🔌 Connecting to database...")
+        conn = connect_db(args)
+        print("✓ Connected to database successfully\n")
         
-        user = {
-            'email': email,
-            'password_hash': '$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LewY5GyYIQn8Qzp.2',
-            'role': 'teacher',
-            'is_active': True
-        }
+        if args.fast_load:
+            fast_load = FastLoad(lambda: connect_db(args), TABLE_ORDER, args.connections)
+            fast_load.prepare()
         
-        teacher = {
-            'user': user,
-            'first_name': first_name,
-            'last_name': last_name,
-            'department': random.choice(DEPARTMENTS),
-            'phone': fake.phone_number()[:20],  # Limit to 20 chars
-            'hire_date': fake.date_between(start_date='-10y', end_date='today')
-        }
+        counts = load_dataset(conn, args.from_dataset, args.batch_size)
+        conn.commit()
+        if fast_load:
+            fast_load.restore()
         
-        teachers.append(teacher)
+        print("\n✅ Dataset loaded successfully!")
+        print("\n" + "=" * 60)
+        print("📈 SUMMARY")
+        print("=" * 60)
+        for table, count in counts.items():
+            print(f"{table.capitalize() + ':':<12}{count}")
+        print("=" * 60)
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        if conn:
+            conn.rollback()
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        # Close first: an interrupted load still holds locks that would block the index rebuild
+        if conn:
+            conn.close()
+            print("\n🔌 Database connection closed")
+        if fast_load:
+            fast_load.finish()
+
+def start_profiling(args):
+    """Start cProfile and tracemalloc when --profile is given; returns the profiler or None"""
+    instruments.progress = args.progress
+    if not args.profile:
+        return None
+    tracemalloc.start()
+    instruments.trace_memory = True
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+def finish_instrumentation(args, profiler=None):
+    """Stop --profile, print the per-phase table and write the --report JSON"""
+    if profiler:
+        profiler.disable()
+        profiler.dump_stats(f"{args.profile}.pstats")
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        with open(f"{args.profile}.tracemalloc.txt", 'w', encoding='utf-8') as f:
+            for stat in snapshot.statistics('lineno')[:PROFILE_TOP]:
+                f.write(f"{stat}\n")
+        print(f"\n🔬 Top {PROFILE_TOP} functions by cumulative time "
+              f"(full profile: {args.profile}.pstats, allocations: {args.profile}.tracemalloc.txt)")
+        pstats.Stats(profiler, stream=sys.stdout).sort_stats('cumulative').print_stats(PROFILE_TOP)
     
-    print(f"✓ Generated {count} teachers")
-    return teachers
+    report = instruments.report()
+    if args.profile or args.report:
+        print("\n" + "=" * 60)
+        print("⏱  PHASES")
+        print("=" * 60)
+        for phase in report['phases']:
+            rate = f"{phase['rows_per_sec']:,.0f} rows/sec" if phase['rows_per_sec'] else ''
+            p95 = f", p95 batch {phase['batch_ms']['p95']:.1f}ms" if 'batch_ms' in phase else ''
+            print(f"{phase['name']:<32}{phase['seconds']:>9.2f}s (busy {phase['busy_seconds']:.2f}s) "
+                  f"{phase['rows']:>10} rows {rate}{p95}")
+        print("=" * 60)
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(dict(generated_at=datetime.now().isoformat(timespec='seconds'), argv=sys.argv[1:], **report),
+                      f, indent=2)
+        print(f"✓ Timing report written to {args.report}")
 
-def generate_classes(teacher_count: int) -> List[Dict[str, Any]]:
-    """Generate class records"""
-    classes = []
+def _admin_connect(args, dbname: str = 'postgres'):
+    """Autocommit connection for CREATE/DROP DATABASE and cluster-wide statistics"""
+    conn = psycopg2.connect(host=args.host, port=args.port, dbname=dbname, user=args.user, password=args.password)
+    conn.autocommit = True
+    return conn
+
+def _recreate_database(admin, name: str, template: str = None):
+    """Drop and recreate a database, optionally as a copy of `template`"""
+    cursor = admin.cursor()
+    cursor.execute(sql.SQL("DROP DATABASE IF EXISTS {}").format(sql.Identifier(name)))
+    if template:
+        cursor.execute(sql.SQL("CREATE DATABASE {} TEMPLATE {}").format(sql.Identifier(name), sql.Identifier(template)))
+    else:
+        cursor.execute(sql.SQL("CREATE DATABASE {}").format(sql.Identifier(name)))
+    cursor.close()
+
+def _wal_bytes(admin) -> int:
+    """Cluster-wide WAL bytes written so far (None before PostgreSQL 14)"""
+    cursor = admin.cursor()
+    try:
+        cursor.execute("SELECT wal_bytes FROM pg_stat_wal")
+        return int(cursor.fetchone()[0])
+    except psycopg2.Error:
+        return None
+    finally:
+        cursor.close()
+
+def _create_schema_database(args, admin, name: str, schemas: List[str]):
+    """Drop and recreate a database and run the schema migrations in it, in order"""
+    _recreate_database(admin, name)
+    conn = _admin_connect(args, name)
+    try:
+        for schema in schemas:
+            with open(schema, encoding='utf-8') as f:
+                conn.cursor().execute(f.read())
+    finally:
+        conn.close()
+
+def create_benchmark_template(args, admin) -> str:
+    """Create an empty database from --schema that every benchmark run is cloned from"""
+    name = f"{args.bench_dbname}_template"
+    _create_schema_database(args, admin, name, [args.schema])
+    print(f"✓ Created template database {name} from {args.schema}")
+    return name
+
+def run_benchmark_case(args, admin, template: str, case: Dict[str, Any], extra: List[str]) -> Dict[str, Any]:
+    """Seed a fresh copy of the template with one configuration and measure it (via its --report)"""
+    _recreate_database(admin, args.bench_dbname, template)
+    command = [
+        sys.executable, os.path.abspath(__file__),
+        '--students', str(case['students']),
+        '--loader', case['loader'],
+        '--workers', str(case['workers']),
+        '--engine', case['engine'],
+        '--host', args.host, '--port', str(args.port), '--user', args.user,
+        '--password', args.password, '--dbname', args.bench_dbname
+    ] + extra
+    report_fd, report_path = tempfile.mkstemp(suffix='.json')
+    os.close(report_fd)
+    command += ['--report', report_path]
     
-    for grade in GRADE_LEVELS:
-        num_classes = random.randint(3, 4)
-        
-        for section in range(1, num_classes + 1):
-            class_data = {
-                'name': f"{grade}A{section}",
-                'grade_level': grade,
-                'academic_year': CURRENT_ACADEMIC_YEAR,
-                'teacher_id': None,
-                'room_number': f"{grade}{section:02d}",
-                'max_students': 40
-            }
-            classes.append(class_data)
+    wal_before = _wal_bytes(admin)
+    started = time.perf_counter()
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                               text=True, encoding='utf-8', env=dict(os.environ, PYTHONIOENCODING='utf-8'))
+    output = process.stdout.read()
+    process.stdout.close()
+    peak_rss = None
+    if hasattr(os, 'wait4'):
+        # wait4 reports the child's own peak RSS (kilobytes on Linux, bytes on macOS)
+        _, status, usage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+        peak_rss = usage.ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+    else:
+        process.wait()
+    wall = time.perf_counter() - started
+    wal_after = _wal_bytes(admin)
     
-    print(f"✓ Generated {len(classes)} classes")
-    return classes
+    result = dict(case, wall_seconds=round(wall, 3), peak_rss_bytes=peak_rss,
+                  wal_bytes=wal_after - wal_before if wal_before is not None else None,
+                  ok=process.returncode == 0, tables={})
+    try:
+        if process.returncode != 0:
+            print(output[-2000:])
+            return result
+        with open(report_path, encoding='utf-8') as f:
+            result['phases'] = json.load(f)['phases']
+    finally:
+        os.remove(report_path)
+    
+    # insert_<table> phases cover each table's load, including streamed generation
+    for phase in result['phases']:
+        if phase['name'].startswith('insert_'):
+            result['tables'][phase['name'][len('insert_'):]] = {
+                key: phase[key] for key in ['rows', 'seconds', 'rows_per_sec', 'busy_seconds']
+            }
+    conn = _admin_connect(args, args.bench_dbname)
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT relname, pg_total_relation_size(relid) FROM pg_stat_user_tables")
+        for table, size in cursor.fetchall():
+            if table in result['tables']:
+                result['tables'][table]['bytes'] = size
+    finally:
+        conn.close()
+    return result
 
-def generate_students(count: int, num_classes: int) -> List[Dict[str, Any]]:
-    """Generate student records with associated user accounts"""
-    students = []
+def compare_to_baseline(runs: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Print wall time and per-table rows/sec against a baseline; return the regressions"""
+    def key(run):
+        return (run['students'], run['loader'], run['workers'], run['engine'])
     
-    for i in range(count):
-        first_name = fake.first_name()
-        last_name = fake.last_name()
-        email = f"student{i+1}@school.edu.vn"
-        
-        user = {
-            'email': email,
-            'password_hash': '$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LewY5GyYIQn8Qzp.2',
-            'role': 'student',
-            'is_active': True
-        }
-        
-        age = random.randint(10, 18)
-        dob = fake.date_of_birth(minimum_age=age, maximum_age=age)
+    previous = {key(run): run for run in baseline.get('runs', []) if run.get('ok')}
+    regressions = []
+    print("\n" + "=" * 60)
+    print(f"📊 COMPARISON WITH BASELINE (tolerance: {tolerance:.0f}%)")
+    print("=" * 60)
+    
+    for run in runs:
+        old = previous.get(key(run))
+        label = f"{run['students']} students, {run['loader']}, {run['workers']} worker(s), {run['engine']}"
+        if old is None or not run['ok']:
+            print(f"   {label}: no baseline" if run['ok'] else f"❌ {label}: run failed")
+            if not run['ok']:
+                regressions.append(f"{label}: run failed")
+            continue
         
-        student = {
-            'user': user,
-            'first_name': first_name,
-            'last_name': last_name,
-            'date_of_birth': dob,
-            'gender': random.choice(['M', 'F']),
-            'class_id': None,
-            'phone': fake.phone_number()[:20] if random.random() > 0.3 else None,
-            'address': fake.address() if random.random() > 0.2 else None,
-            'parent_name': fake.name(),
-            'parent_phone': fake.phone_number()[:20],
-            'parent_email': fake.email() if random.random() > 0.3 else None
-        }
+        change = (run['wall_seconds'] - old['wall_seconds']) / old['wall_seconds'] * 100
+        flag = '❌' if change > tolerance else '✓'
+        print(f"{flag} {label}: {old['wall_seconds']:.2f}s -> {run['wall_seconds']:.2f}s ({change:+.1f}%)")
+        if change > tolerance:
+            regressions.append(f"{label}: wall time {change:+.1f}%")
         
-        students.append(student)
+        for table, stats in run['tables'].items():
+            before = old['tables'].get(table)
+            # Sub-second loads are too noisy to compare
+            if not before or not before.get('rows_per_sec') or before['seconds'] < BENCHMARK_MIN_SECONDS:
+                continue
+            change = (stats['rows_per_sec'] - before['rows_per_sec']) / before['rows_per_sec'] * 100
+            flag = '❌' if change < -tolerance else ' '
+            print(f"   {flag} {table}: {before['rows_per_sec']:,.0f} -> {stats['rows_per_sec']:,.0f} rows/sec ({change:+.1f}%)")
+            if change < -tolerance:
+                regressions.append(f"{label}: {table} rows/sec {change:+.1f}%")
     
-    print(f"✓ Generated {count} students")
-    return students
+    print("=" * 60)
+    return regressions
 
-def insert_users(conn, users: List[Dict[str, Any]]) -> Dict[str, str]:
-    """Insert users and return email to id mapping"""
-    cursor = conn.cursor()
+def benchmark_main(argv: List[str]):
+    """benchmark subcommand: seed throwaway databases across scales, loaders and worker counts"""
+    parser = argparse.ArgumentParser(
+        prog='generate_mock_data.py benchmark',
+        description='Benchmark mock data generation and loading against a throwaway database. '
+                    'Unrecognised options (e.g. --days 30 --workload timeseries) are passed to every run.'
+    )
+    parser.add_argument('--scales', default=','.join(map(str, BENCHMARK_SCALES)),
+                        help=f'Comma-separated student counts (default: {",".join(map(str, BENCHMARK_SCALES))})')
+    loaders = [loader for loader in LOADERS if loader != 'async' or asyncpg is not None]
+    parser.add_argument('--loaders', default=','.join(loaders),
+                        help=f'Comma-separated loaders (default: {",".join(loaders)})')
+    parser.add_argument('--workers', default='1', help='Comma-separated worker counts (default: 1)')
+    parser.add_argument('--engines', default='python', help='Comma-separated engines (default: python)')
+    parser.add_argument('--host', default='localhost', help='Database host')
+    parser.add_argument('--port', default='5432', help='Database port')
+    parser.add_argument('--user', default='postgres', help='Database user')
+    parser.add_argument('--password', default='postgres', help='Database password')
+    parser.add_argument('--bench-dbname', default='school_dashboard_bench',
+                        help='Scratch database, dropped and recreated for every run (default: school_dashboard_bench)')
+    parser.add_argument('--template', metavar='DB',
+                        help='Existing empty database with the schema to clone (default: build one from --schema)')
+    parser.add_argument('--schema', default=SCHEMA_FILE,
+                        help='Schema migration used to build the template (default: database/migrations/001_create_schema.sql)')
+    parser.add_argument('--results', default='benchmark_results.json',
+                        help='JSON file for the results (default: benchmark_results.json)')
+    parser.add_argument('--baseline', metavar='PATH', help='Earlier --results file to compare against')
+    parser.add_argument('--tolerance', type=float, default=10.0,
+                        help='Allowed slowdown in percent before a run counts as a regression (default: 10)')
     
-    email_to_id = {}
+    args, extra = parser.parse_known_args(argv)
+    if args.bench_dbname == args.template:
+        print("Error: --bench-dbname must differ from --template (it is dropped for every run)")
+        sys.exit(1)
     
-    # Insert in batches to ensure all RETURNING values are captured
-    batch_size = 50
-    for i in range(0, len(users), batch_size):
-        batch = users[i:i + batch_size]
-        
-        values = [
-            (
-                u['email'],
-                u['password_hash'],
-                u['role'],
-                u['is_active']
-            )
-            for u in batch
-        ]
-        
-        query = """
-            INSERT INTO users (email, password_hash, role, is_active)
-            VALUES %s
-            RETURNING email, id
-        """
-        
-        execute_values(cursor, query, values, template='(%s, %s, %s, %s)')
-        results = cursor.fetchall()
-        
-        # Add to mapping
-        for email, user_id in results:
-            email_to_id[email] = str(user_id)
+    cases = [
+        {'students': int(students), 'loader': loader, 'workers': int(workers), 'engine': engine}
+        for students in args.scales.split(',')
+        for loader in args.loaders.split(',')
+        for workers in args.workers.split(',')
+        for engine in args.engines.split(',')
+    ]
     
-    cursor.close()
+    print("=" * 60)
+    print("AI SCHOOL DASHBOARD - MOCK DATA BENCHMARK")
+    print("=" * 60)
+    print(f"{len(cases)} runs against {args.host}:{args.port}/{args.bench_dbname}\n")
     
-    print(f"✓ Inserted {len(users)} users into database")
-    print(f"  📧 Created {len(email_to_id)} email mappings")
+    admin = _admin_connect(args)
+    template = args.template or create_benchmark_template(args, admin)
+    runs = []
+    try:
+        for i, case in enumerate(cases, 1):
+            print(f"⏱  [{i}/{len(cases)}] {case['students']} students, loader {case['loader']}, "
+                  f"{case['workers']} worker(s), engine {case['engine']}...")
+            run = run_benchmark_case(args, admin, template, case, extra)
+            runs.append(run)
+            if run['ok']:
+                rss = f"{run['peak_rss_bytes'] / 2**20:.0f} MB" if run['peak_rss_bytes'] else 'n/a'
+                wal = f"{run['wal_bytes'] / 2**20:.0f} MB" if run['wal_bytes'] is not None else 'n/a'
+                print(f"✓ {run['wall_seconds']:.2f}s, peak RSS {rss}, WAL {wal}")
+            else:
+                print("❌ Run failed")
+    finally:
+        admin.cursor().execute(sql.SQL("DROP DATABASE IF EXISTS {}").format(sql.Identifier(args.bench_dbname)))
+        if not args.template:
+            admin.cursor().execute(sql.SQL("DROP DATABASE IF EXISTS {}").format(sql.Identifier(template)))
+        server_version = admin.server_version
+        admin.close()
     
-    if len(email_to_id) != len(users):
-        print(f"⚠️  WARNING: Expected {len(users)} mappings but got {len(email_to_id)}")
-        print(f"⚠️  Missing {len(users) - len(email_to_id)} mappings!")
+    with open(args.results, 'w', encoding='utf-8') as f:
+        json.dump({
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'postgres': server_version,
+            'extra_args': extra,
+            'runs': runs
+        }, f, indent=2)
+    print(f"\n✓ Results written to {args.results}")
     
-    return email_to_id
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare_to_baseline(runs, json.load(f), args.tolerance)
+    failed = [run for run in runs if not run['ok']]
+    if regressions or failed:
+        for regression in regressions:
+            print(f"❌ Regression: {regression}")
+        sys.exit(1)
 
-def insert_teachers(conn, teachers: List[Dict[str, Any]], email_to_id: Dict[str, str]) -> List[str]:
-    """Insert teachers and return list of teacher IDs"""
-    cursor = conn.cursor()
-    
-    values = []
-    for i, t in enumerate(teachers):
-        teacher_email = t['user']['email']
-        
-        # Debug: Check if email exists
-        if teacher_email not in email_to_id:
-            print(f"\n❌ ERROR: Email '{teacher_email}' not found in mapping!")
-            print(f"📧 Available emails in mapping ({len(email_to_id)}):")
-            for j, email in enumerate(sorted(email_to_id.keys())):
-                if j < 10:  # Show first 10
-                    print(f"  {j+1}. {email}")
-            print(f"\n🔍 All teacher emails generated:")
-            for j, teacher in enumerate(teachers):
-                print(f"  {j+1}. {teacher['user']['email']}")
-            raise KeyError(f"Email {teacher_email} not found in email_to_id mapping")
-        
-        values.append((
-            email_to_id[teacher_email],
-            t['first_name'],
-            t['last_name'],
-            t['department'],
-            t['phone'],
-            t['hire_date']
-        ))
-    
-    query = """
-        INSERT INTO teachers (user_id, first_name, last_name, department, phone, hire_date)
-        VALUES %s
-        RETURNING id
+def snapshot_key(schemas: List[str], extra: List[str]) -> str:
+    """Hash of everything that shapes a seeded database: generator arguments (and --scenario file),
+    schema migrations and this script
     """
-    
-    execute_values(cursor, query, values)
-    results = cursor.fetchall()
-    
-    teacher_ids = [str(teacher_id[0]) for teacher_id in results]
+    digest = hashlib.blake2b(digest_size=8)
+    paths = list(schemas) + [os.path.abspath(__file__)]
+    paths += [extra[i + 1] for i, arg in enumerate(extra[:-1]) if arg == '--scenario']
+    paths += [arg.split('=', 1)[1] for arg in extra if arg.startswith('--scenario=')]
+    digest.update(json.dumps(extra).encode('utf-8'))
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(hashlib.blake2b(f.read()).digest())
+    return digest.hexdigest()
+
+def _template_key(admin, name: str) -> str:
+    """Snapshot key recorded on a template database (None if it is missing or was never completed)"""
+    cursor = admin.cursor()
+    cursor.execute("SELECT shobj_description(oid, 'pg_database') FROM pg_database WHERE datname = %s", (name,))
+    row = cursor.fetchone()
     cursor.close()
-    
-    print(f"✓ Inserted {len(teachers)} teachers into database")
-    return teacher_ids
+    prefix = SNAPSHOT_COMMENT.format(key='')
+    if row and row[0] and row[0].startswith(prefix):
+        return row[0][len(prefix):]
+    return None
 
-def insert_classes(conn, classes: List[Dict[str, Any]], teacher_ids: List[str]) -> List[str]:
-    """Insert classes and return list of class IDs"""
-    cursor = conn.cursor()
-    
-    values = [
-        (
-            c['name'],
-            c['grade_level'],
-            c['academic_year'],
-            random.choice(teacher_ids),
-            c['room_number'],
-            c['max_students']
-        )
-        for c in classes
+def _pg_tool(name: str) -> str:
+    path = shutil.which(name)
+    if path is None:
+        print(f"Error: {name} not found on PATH (install the PostgreSQL client tools)")
+        sys.exit(1)
+    return path
+
+def _pg_env(args) -> Dict[str, str]:
+    return dict(os.environ, PGPASSWORD=args.password)
+
+def seed_snapshot(args, admin, key: str, extra: List[str]):
+    """Seed --template from scratch with the generator arguments, mark it with key and archive it"""
+    print(f"📊 Seeding template database {args.template} (snapshot {key})...")
+    _create_schema_database(args, admin, args.template, args.schema)
+    command = [sys.executable, os.path.abspath(__file__)] + extra + [
+        '--host', args.host, '--port', str(args.port), '--user', args.user,
+        '--password', args.password, '--dbname', args.template
     ]
+    if subprocess.call(command) != 0:
+        admin.cursor().execute(sql.SQL("DROP DATABASE IF EXISTS {}").format(sql.Identifier(args.template)))
+        print("❌ Seeding failed; template database dropped")
+        sys.exit(1)
+    # Marked only once complete, so an interrupted seed is never cloned
+    admin.cursor().execute(sql.SQL("COMMENT ON DATABASE {} IS {}").format(
+        sql.Identifier(args.template), sql.Literal(SNAPSHOT_COMMENT.format(key=key))))
+    print(f"✓ Template database {args.template} seeded")
     
-    query = """
-        INSERT INTO classes (name, grade_level, academic_year, teacher_id, room_number, max_students)
-        VALUES %s
-        RETURNING id
-    """
+    if args.archive_dir:
+        os.makedirs(args.archive_dir, exist_ok=True)
+        archive = os.path.join(args.archive_dir, f"{key}.dump")
+        started = time.perf_counter()
+        subprocess.run([_pg_tool('pg_dump'), '-Fc', '-h', args.host, '-p', str(args.port), '-U', args.user,
+                        '-f', archive + '.tmp', args.template], env=_pg_env(args), check=True)
+        os.replace(archive + '.tmp', archive)
+        print(f"💾 Archived to {archive} in {time.perf_counter() - started:.2f}s")
+
+def snapshot_main(argv: List[str], command: str):
+    """snapshot/restore subcommands: seed a template database once, then clone it for every reset"""
+    parser = argparse.ArgumentParser(
+        prog=f'generate_mock_data.py {command}',
+        description='Seed a template database once and clone it (CREATE DATABASE ... TEMPLATE) or restore '
+                    'a cached pg_dump archive instead of regenerating. Unrecognised options '
+                    '(e.g. --students 200000 --loader copy) are passed to the generator and, together with '
+                    'the schema migration, select the snapshot.',
+        allow_abbrev=False
+    )
+    parser.add_argument('--host', default='localhost', help='Database host')
+    parser.add_argument('--port', default='5432', help='Database port')
+    parser.add_argument('--user', default='postgres', help='Database user')
+    parser.add_argument('--password', default='postgres', help='Database password')
+    parser.add_argument('--template', default=SNAPSHOT_TEMPLATE,
+                        help=f'Template database holding the seeded snapshot (default: {SNAPSHOT_TEMPLATE})')
+    parser.add_argument('--schema', nargs='+', default=[SCHEMA_FILE], metavar='PATH',
+                        help='Schema migrations the template is built from, in order; with --rollups '
+                             '002_create_rollups.sql is added when missing '
+                             '(default: database/migrations/001_create_schema.sql)')
+    parser.add_argument('--archive-dir', metavar='DIR',
+                        help='Also keep pg_dump -Fc archives here, named by snapshot key, and restore from them '
+                             'when the template is missing')
+    if command == 'restore':
+        parser.add_argument('--dbname', default='school_dashboard_test',
+                            help='Database to replace with a fresh copy (default: school_dashboard_test)')
+    else:
+        parser.add_argument('--force', action='store_true', help='Reseed even if the template is up to date')
     
-    execute_values(cursor, query, values)
-    results = cursor.fetchall()
+    args, extra = parser.parse_known_args(argv)
+    if command == 'restore' and args.dbname == args.template:
+        print("Error: --dbname must differ from --template")
+        sys.exit(1)
+    if '--rollups' in extra and os.path.abspath(ROLLUPS_SCHEMA_FILE) not in map(os.path.abspath, args.schema):
+        args.schema.append(ROLLUPS_SCHEMA_FILE)
+    key = snapshot_key(args.schema, extra)
+    archive = os.path.join(args.archive_dir, f"{key}.dump") if args.archive_dir else None
     
-    class_ids = [str(class_id[0]) for class_id in results]
-    cursor.close()
+    admin = _admin_connect(args)
+    try:
+        current = _template_key(admin, args.template) == key
+        if command == 'snapshot':
+            if current and not args.force:
+                print(f"✓ Template database {args.template} already holds snapshot {key}")
+            else:
+                seed_snapshot(args, admin, key, extra)
+            return
+        
+        started = time.perf_counter()
+        if current:
+            _recreate_database(admin, args.dbname, args.template)
+            source = f"template {args.template}"
+        elif archive and os.path.exists(archive):
+            _recreate_database(admin, args.dbname)
+            subprocess.run([_pg_tool('pg_restore'), '--no-owner', '-h', args.host, '-p', str(args.port),
+                            '-U', args.user, '-d', args.dbname, archive], env=_pg_env(args), check=True)
+            source = archive
+        else:
+            print(f"⏭  No snapshot {key} yet")
+            seed_snapshot(args, admin, key, extra)
+            started = time.perf_counter()
+            _recreate_database(admin, args.dbname, args.template)
+            source = f"template {args.template}"
+        print(f"⚡ Restored {args.dbname} from {source} in {time.perf_counter() - started:.2f}s")
+    finally:
+        admin.close()
+
+def load_scenario(path: str) -> Dict[str, Any]:
+    """Read a scenario file: TOML, or YAML (.yaml/.yml) when PyYAML is installed"""
+    if path.endswith(('.yaml', '.yml')):
+        if yaml is None:
+            raise ValueError("YAML scenarios require PyYAML (pip install pyyaml)")
+        with open(path, encoding='utf-8') as f:
+            try:
+                scenario = yaml.safe_load(f) or {}
+            except yaml.YAMLError as e:
+                raise ValueError(f"{path}: {e}")
+    else:
+        if tomllib is None:
+            raise ValueError("TOML scenarios require Python 3.11+ (tomllib); use a .yaml scenario instead")
+        with open(path, 'rb') as f:
+            try:
+                scenario = tomllib.load(f)
+            except tomllib.TOMLDecodeError as e:
+                raise ValueError(f"{path}: {e}")
     
-    print(f"✓ Inserted {len(classes)} classes into database")
-    return class_ids
+    if not isinstance(scenario, dict):
+        raise ValueError(f"{path}: expected a mapping of sections at the top level")
+    return scenario
 
-def insert_students(conn, students: List[Dict[str, Any]], email_to_id: Dict[str, str], class_ids: List[str]) -> List[str]:
-    """Insert students and return list of student IDs"""
-    cursor = conn.cursor()
+def validate_scenario(scenario: Dict[str, Any]) -> List[str]:
+    """Check a scenario against the generator and the schema constraints; returns the problems found"""
+    problems = []
     
-    students_per_class = len(students) // len(class_ids)
+    def section(name: str, keys: Sequence[str] = None) -> Dict[str, Any]:
+        value = scenario.get(name, {})
+        if not isinstance(value, dict):
+            problems.append(f"[{name}] must be a table of settings")
+            return {}
+        for key in value:
+            if keys is not None and key not in keys:
+                problems.append(f"{name}.{key}: unknown setting (expected one of {', '.join(keys)})")
+        return value
     
-    values = []
-    for i, s in enumerate(students):
-        student_email = s['user']['email']
-        
-        if student_email not in email_to_id:
-            raise KeyError(f"Student email {student_email} not found in mapping")
-        
-        class_id = class_ids[i // students_per_class] if i < len(students) - len(class_ids) else random.choice(class_ids)
-        
-        values.append((
-            email_to_id[student_email],
-            s['first_name'],
-            s['last_name'],
-            s['date_of_birth'],
-            s['gender'],
-            class_id,
-            s['phone'],
-            s['address'],
-            s['parent_name'],
-            s['parent_phone'],
-            s['parent_email']
-        ))
+    def is_int(value: Any, low: int, high: int = None) -> bool:
+        return (isinstance(value, int) and not isinstance(value, bool)
+                and value >= low and (high is None or value <= high))
     
-    query = """
-        INSERT INTO students (
-            user_id, first_name, last_name, date_of_birth, gender, class_id,
-            phone, address, parent_name, parent_phone, parent_email
-        )
-        VALUES %s
-        RETURNING id
-    """
+    def is_number(value: Any) -> bool:
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
     
-    execute_values(cursor, query, values)
-    results = cursor.fetchall()
+    for key in scenario:
+        if key not in SCENARIO_SECTIONS:
+            problems.append(f"{key}: unknown section (expected one of {', '.join(SCENARIO_SECTIONS)})")
     
-    student_ids = [str(student_id[0]) for student_id in results]
-    cursor.close()
+    run = section('run', list(SCENARIO_RUN_OPTIONS))
+    choices = {'workload': WORKLOADS, 'engine': ENGINES, 'loader': LOADERS}
+    for key, value in run.items():
+        if key in SCENARIO_RUN_MIN_ONE and not is_int(value, 1):
+            problems.append(f"run.{key}: expected a positive integer, got {value!r}")
+        elif SCENARIO_RUN_OPTIONS.get(key) is int and not is_int(value, 0):
+            problems.append(f"run.{key}: expected a non-negative integer, got {value!r}")
+        elif key in choices and value not in choices[key]:
+            problems.append(f"run.{key}: expected one of {', '.join(choices[key])}, got {value!r}")
     
-    print(f"✓ Inserted {len(students)} students into database")
-    return student_ids
-
-def generate_courses(class_ids: List[str], teacher_ids: List[str]) -> List[Dict[str, Any]]:
-    """Generate course records"""
-    courses = []
-    used_codes = set()  # Track used course codes to ensure uniqueness
+    layout = section('layout', ['schools', 'grade_levels', 'sections_per_grade', 'max_students'])
+    if 'schools' in layout and not is_int(layout['schools'], 1):
+        problems.append(f"layout.schools: expected a positive integer, got {layout['schools']!r}")
+    if 'grade_levels' in layout:
+        levels = layout['grade_levels']
+        if (not isinstance(levels, list) or not levels or len(set(levels)) != len(levels)
+                or not all(is_int(level, 6, 12) for level in levels)):
+            problems.append(f"layout.grade_levels: expected distinct grade levels 6-12, got {levels!r}")
+    if 'sections_per_grade' in layout:
+        sections = layout['sections_per_grade']
+        if (not isinstance(sections, list) or len(sections) != 2
+                or not all(is_int(n, 1) for n in sections) or sections[0] > sections[1]):
+            problems.append(f"layout.sections_per_grade: expected [min, max] with 1 <= min <= max, got {sections!r}")
+    if 'max_students' in layout and not is_int(layout['max_students'], 1, 50):
+        problems.append(f"layout.max_students: expected 1-50 (check_max_students), got {layout['max_students']!r}")
     
-    for class_id in class_ids:
-        num_subjects = random.randint(8, len(SUBJECTS))
-        selected_subjects = random.sample(SUBJECTS, num_subjects)
-        
-        for semester in [1, 2]:
-            for code_prefix, name in selected_subjects:
-                # Generate unique code
-                while True:
-                    code_suffix = random.randint(100, 999)
-                    code = f"{code_prefix}{code_suffix}"
-                    if code not in used_codes:
-                        used_codes.add(code)
-                        break
-                
-                course = {
-                    'name': name,
-                    'code': code,
-                    'description': f"{name} - Semester {semester}",
-                    'teacher_id': random.choice(teacher_ids),
-                    'class_id': class_id,
-                    'semester': semester,
-                    'academic_year': CURRENT_ACADEMIC_YEAR,
-                    'credits': random.choice([1, 2, 3])
-                }
-                courses.append(course)
+    distributions = section('distributions', ['attendance', 'exam_weights'])
+    expected = {'attendance': ATTENDANCE_STATUSES, 'exam_weights': list(EXAM_TYPES)}
+    for key, names in expected.items():
+        if key not in distributions:
+            continue
+        weights = distributions[key]
+        if not isinstance(weights, dict) or sorted(weights) != sorted(names):
+            problems.append(f"distributions.{key}: expected weights for exactly {', '.join(names)}")
+        elif not all(is_number(w) and w >= 0 for w in weights.values()) or not sum(weights.values()) > 0:
+            problems.append(f"distributions.{key}: weights must be non-negative numbers with a positive sum")
+        elif key == 'exam_weights' and not all(0 < w <= 2 for w in weights.values()):
+            problems.append("distributions.exam_weights: each weight must be in (0, 2] (check_weight)")
     
-    print(f"✓ Generated {len(courses)} courses")
-    return courses
+    catalog = section('catalog', ['departments', 'subjects'])
+    if 'departments' in catalog:
+        departments = catalog['departments']
+        if (not isinstance(departments, list) or not departments
+                or not all(isinstance(d, str) and 0 < len(d) <= 100 for d in departments)):
+            problems.append("catalog.departments: expected a non-empty list of names of up to 100 characters")
+    if 'subjects' in catalog:
+        subjects = catalog['subjects']
+        valid = isinstance(subjects, list) and all(
+            isinstance(subject, list) and len(subject) == 2
+            and isinstance(subject[0], str) and subject[0].isalnum() and subject[0].isupper()
+            and not subject[0][-1].isdigit() and len(subject[0]) <= 17 and isinstance(subject[1], str) and 0 < len(subject[1]) <= 100
+            for subject in subjects
+        )
+        if not valid:
+            problems.append("catalog.subjects: expected [code, name] pairs with upper-case codes of up to 17 "
+                            "characters that do not end in a digit (a suffix of 3 or more digits is added, "
+                            "so PE and PE1 would collide) and names of up to 100")
+        elif len(subjects) < 8 or len({code for code, _ in subjects}) != len(subjects):
+            problems.append("catalog.subjects: expected at least 8 subjects with distinct codes "
+                            "(every class takes 8 or more)")
     
-    print(f"✓ Generated {len(courses)} courses")
-    return courses
+    return problems
 
-def insert_courses(conn, courses: List[Dict[str, Any]]) -> List[str]:
-    """Insert courses and return list of course IDs"""
-    cursor = conn.cursor()
+def apply_scenario(scenario: Dict[str, Any]):
+    """Replace the module-level shape and distribution settings with a validated scenario's
     
-    values = [
-        (
-            c['name'],
-            c['code'],
-            c['description'],
-            c['teacher_id'],
-            c['class_id'],
-            c['semester'],
-            c['academic_year'],
-            c['credits']
-        )
-        for c in courses
-    ]
+    The scenario is recorded in WORKER_SETTINGS so map_shards workers apply it too.
+    """
+    global SCHOOLS, GRADE_LEVELS, SECTIONS_PER_GRADE, CLASS_MAX_STUDENTS
+    global ATTENDANCE_WEIGHTS, EXAM_TYPES, DEPARTMENTS, SUBJECTS
+    layout = scenario.get('layout', {})
+    distributions = scenario.get('distributions', {})
+    catalog = scenario.get('catalog', {})
     
-    query = """
-        INSERT INTO courses (
-            name, code, description, teacher_id, class_id, semester, academic_year, credits
-        )
-        VALUES %s
-        RETURNING id
+    SCHOOLS = layout.get('schools', SCHOOLS)
+    GRADE_LEVELS = list(layout.get('grade_levels', GRADE_LEVELS))
+    SECTIONS_PER_GRADE = tuple(layout.get('sections_per_grade', SECTIONS_PER_GRADE))
+    CLASS_MAX_STUDENTS = layout.get('max_students', CLASS_MAX_STUDENTS)
+    if 'attendance' in distributions:
+        ATTENDANCE_WEIGHTS = [distributions['attendance'][status] for status in ATTENDANCE_STATUSES]
+    if 'exam_weights' in distributions:
+        # Keep EXAM_TYPES' order: generators draw per exam type in this order
+        EXAM_TYPES = {exam_type: distributions['exam_weights'][exam_type] for exam_type in EXAM_TYPES}
+    DEPARTMENTS = list(catalog.get('departments', DEPARTMENTS))
+    SUBJECTS = [tuple(subject) for subject in catalog.get('subjects', SUBJECTS)]
+    WORKER_SETTINGS['scenario'] = scenario
+
+def capacity_problems(classes: List[ClassRow]) -> List[str]:
+    """Reasons a class layout cannot be generated (course codes too long for courses.code)"""
+    problems = []
+    # Worst case: every class takes every subject in both semesters
+    codes = 2 * len(classes)
+    suffix_digits = len(str(99 + codes)) if codes > 900 else 3
+    for prefix, _ in SUBJECTS:
+        if len(prefix) + suffix_digits > COURSE_CODE_LENGTH:
+            problems.append(f"{len(classes)} classes need up to {codes} course codes per subject, "
+                            f"but {prefix}<{suffix_digits} digits> exceeds {COURSE_CODE_LENGTH} characters")
+    return problems
+
+def _format_bytes(size: float) -> str:
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if size < 1024 or unit == 'GB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+
+def plan_seed(args) -> tuple:
+    """Row counts per table as (rows, exact) for a run, and capacity_problems(), without the database
+    
+    Replays the cheap seeded steps of main() (classes, courses and, for the
+    timeseries workload, class assignment and the calendar), so those counts
+    are exact. Snapshot attendance skips ~10% of days at random and is an
+    estimate, as is the grade count when --grades exceeds what is generated.
+    Rows are None (with the reasons) when the layout cannot be generated.
     """
+    seed_generators(args.seed, 'classes')
+    classes = generate_classes(args.teachers, args.seed, args.years if args.workload == 'timeseries' else 1,
+                               args.students)
+    class_ids = [c.id for c in classes if c.academic_year == CURRENT_ACADEMIC_YEAR]
+    problems = capacity_problems(classes)
+    if problems:
+        return None, problems
     
-    execute_values(cursor, query, values)
-    results = cursor.fetchall()
+    teacher_ids = [entity_uuid(args.seed, 'teachers', i + 1) for i in range(args.teachers)]
+    seed_generators(args.seed, 'courses')
+    courses = generate_courses([c.id for c in classes], teacher_ids, args.seed,
+                               {c.id: c.academic_year for c in classes})
+    rows = {
+        'users': (1 + args.teachers + args.students, True),
+        'teachers': (args.teachers, True),
+        'classes': (len(classes), True),
+        'students': (args.students, True),
+        'courses': (len(courses), True)
+    }
     
-    course_ids = [str(course_id[0]) for course_id in results]
-    cursor.close()
+    if args.workload == 'timeseries':
+        # Only IDs and class assignments matter to the calendar
+        students = [
+            StudentRow._make([entity_uuid(args.seed, 'students', i + 1)] + [None] * (len(StudentRow._fields) - 1))
+            for i in range(args.students)
+        ]
+        assign_classes(students, class_ids)
+        plan = plan_timeseries(classes, courses, students, args.seed, args.periods_per_day)
+        rows['grades'] = (sum(len(ids) * len(exams) for _, sessions in plan for ids, _, _, exams in sessions), True)
+        rows['attendance'] = (sum(len(ids) * len(periods) for _, sessions in plan for ids, _, periods, _ in sessions), True)
+    else:
+        # Each student takes 8..10 courses with one grade per exam type
+        per_student = len(EXAM_TYPES) * min(8, len(courses))
+        if args.grades <= args.students * per_student:
+            rows['grades'] = (args.grades, True)
+        else:
+            rows['grades'] = (args.students * len(EXAM_TYPES) * (8 + min(10, len(courses))) // 2, False)
+        start = date.today() - timedelta(days=args.days)
+        weekdays = sum(1 for day in range(args.days) if (start + timedelta(days=day)).weekday() < 5)
+        rows['attendance'] = (int(args.students * weekdays * 0.9), False)
     
-    print(f"✓ Inserted {len(courses)} courses into database")
-    return course_ids
+    return rows, problems
 
-def generate_grades(student_ids: List[str], course_ids: List[str], count: int) -> List[Dict[str, Any]]:
-    """Generate grade records"""
-    grades = []
+def plan_main(args, scenario: Dict[str, Any] = None):
+    """--plan: print row counts, estimated size and load time for the configured run, then exit"""
+    print("=" * 60)
+    print("AI SCHOOL DASHBOARD - SEED PLAN")
+    print("=" * 60)
+    if scenario:
+        print(f"Scenario: {scenario.get('name', args.scenario)} ({args.scenario})")
+        if scenario.get('description'):
+            print(f"   {scenario['description']}")
+    print(f"Layout: {SCHOOLS} school(s), grades {GRADE_LEVELS[0]}-{GRADE_LEVELS[-1]}, "
+          f"{SECTIONS_PER_GRADE[0]}-{SECTIONS_PER_GRADE[1]} sections per grade, {CLASS_MAX_STUDENTS} seats per class")
+    print(f"Run: seed {args.seed}, workload {args.workload}, loader {args.loader}, engine {args.engine}")
+    print()
     
-    for student_id in student_ids:
-        num_courses = random.randint(8, min(10, len(course_ids)))
-        student_courses = random.sample(course_ids, num_courses)
-        
-        for course_id in student_courses:
-            base_grade = random.uniform(5.0, 9.5)
-            
-            for exam_type, weight in EXAM_TYPES.items():
-                grade_value = max(0, min(10, base_grade + random.uniform(-1.5, 1.5)))
-                
-                if exam_type == 'quiz':
-                    exam_date = fake.date_between(start_date='-60d', end_date='-30d')
-                elif exam_type == 'assignment':
-                    exam_date = fake.date_between(start_date='-45d', end_date='-15d')
-                elif exam_type == 'midterm':
-                    exam_date = fake.date_between(start_date='-30d', end_date='-10d')
-                else:
-                    exam_date = fake.date_between(start_date='-10d', end_date='today')
-                
-                grade = {
-                    'student_id': student_id,
-                    'course_id': course_id,
-                    'grade': round(grade_value, 2),
-                    'exam_type': exam_type,
-                    'exam_date': exam_date,
-                    'weight': weight,
-                    'notes': fake.sentence() if random.random() > 0.8 else None
-                }
-                grades.append(grade)
-                
-                if len(grades) >= count:
-                    print(f"✓ Generated {len(grades)} grades")
-                    return grades
+    rows, problems = plan_seed(args)
+    if rows is None:
+        for problem in problems:
+            print(f"❌ {problem}")
+        sys.exit(1)
     
-    print(f"✓ Generated {len(grades)} grades")
-    return grades
-
-def insert_grades(conn, grades: List[Dict[str, Any]]):
-    """Insert grades"""
-    cursor = conn.cursor()
+    # Measured rates and row sizes from a benchmark run with the same loader and engine, if given
+    rates = {table: DEFAULT_ROWS_PER_SEC[args.loader] for table in TABLE_ORDER}
+    row_bytes = dict(ROW_BYTES)
+    source = f"default {args.loader} rate of {DEFAULT_ROWS_PER_SEC[args.loader]:,} rows/sec"
+    if args.benchmark_results:
+        with open(args.benchmark_results, encoding='utf-8') as f:
+            runs = [
+                run for run in json.load(f).get('runs', [])
+                if run.get('ok') and run['loader'] == args.loader and run['engine'] == args.engine
+            ]
+        if runs:
+            run = max(runs, key=lambda run: run['students'])
+            for table, measured in run['tables'].items():
+                if measured.get('rows_per_sec'):
+                    rates[table] = measured['rows_per_sec']
+                if measured.get('bytes') and measured.get('rows'):
+                    row_bytes[table] = measured['bytes'] / measured['rows']
+            source = f"rates measured at {run['students']} students in {args.benchmark_results}"
+        else:
+            print(f"⚠ No successful {args.loader}/{args.engine} run in {args.benchmark_results}; using default rates")
     
-    values = [
-        (
-            g['student_id'],
-            g['course_id'],
-            g['grade'],
-            g['exam_type'],
-            g['exam_date'],
-            g['weight'],
-            g['notes']
-        )
-        for g in grades
-    ]
+    print(f"{'Table':<12} {'Rows':>16} {'Est. size':>12} {'Est. load':>10}")
+    total_rows = total_bytes = total_seconds = 0
+    total_exact = all(exact for _, exact in rows.values())
+    for table in TABLE_ORDER:
+        count, exact = rows[table]
+        size = count * row_bytes[table]
+        seconds = count / rates[table]
+        total_rows += count
+        total_bytes += size
+        total_seconds += seconds
+        print(f"{table:<12} {('' if exact else '≈') + f'{count:,}':>16} {_format_bytes(size):>12} {seconds:>9.1f}s")
+    print(f"{'Total':<12} {('' if total_exact else '≈') + f'{total_rows:,}':>16} {_format_bytes(total_bytes):>12} {total_seconds:>9.1f}s")
+    print(f"\n⏱  Load time estimated from the {source}")
+    print("   ≈ marks counts that depend on random skips; all others are exact for this seed")
+
+def load_population(args) -> Dict[str, List[Dict[str, Any]]]:
+    """Seeded accounts per role with the IDs their requests use, replayed like plan_seed()
     
-    query = """
-        INSERT INTO grades (student_id, course_id, grade, exam_type, exam_date, weight, notes)
-        VALUES %s
+    Teachers get the current-year courses they teach (and those courses'
+    classes), students their own ID and homeroom class.
     """
+    seed_generators(args.seed, 'classes')
+    classes = generate_classes(args.teachers, args.seed, args.years, args.students)
+    class_ids = [c.id for c in classes if c.academic_year == CURRENT_ACADEMIC_YEAR]
+    teacher_ids = [entity_uuid(args.seed, 'teachers', i + 1) for i in range(args.teachers)]
+    seed_generators(args.seed, 'courses')
+    courses = generate_courses([c.id for c in classes], teacher_ids, args.seed,
+                               {c.id: c.academic_year for c in classes})
+    courses = [c for c in courses if c.academic_year == CURRENT_ACADEMIC_YEAR]
+    students = [
+        StudentRow._make([entity_uuid(args.seed, 'students', i + 1)] + [None] * (len(StudentRow._fields) - 1))
+        for i in range(args.students)
+    ]
+    assign_classes(students, class_ids)
     
-    execute_values(cursor, query, values)
-    cursor.close()
-    
-    print(f"✓ Inserted {len(grades)} grades into database")
+    taught = {}
+    for course in courses:
+        taught.setdefault(course.teacher_id, []).append(course)
+    teachers = []
+    for i, teacher_id in enumerate(teacher_ids):
+        # Teachers without a course of their own browse a random one
+        own = taught.get(teacher_id) or [random.choice(courses)]
+        teachers.append({
+            'email': f"teacher{i + 1}@school.edu.vn",
+            'courseId': [c.id for c in own],
+            'classId': sorted({c.class_id for c in own})
+        })
+    return {
+        'teacher': teachers,
+        'student': [
+            {'email': f"student{i + 1}@school.edu.vn", 'studentId': [s.id], 'classId': [s.class_id]}
+            for i, s in enumerate(students)
+        ]
+    }
+
+def _percentile(latencies: List[float], q: float) -> float:
+    """Nearest-rank percentile of sorted latencies, in milliseconds (0 when there are none)"""
+    if not latencies:
+        return 0.0
+    return round(latencies[min(len(latencies) - 1, int(len(latencies) * q))] * 1000, 3)
 
-def generate_attendance(student_ids: List[str], days: int = 90) -> List[Dict[str, Any]]:
-    """Generate attendance records"""
-    attendance = []
+async def _drive_load(args, population: Dict[str, List[Dict[str, Any]]], stats: Dict[str, Dict[str, Any]]):
+    """Coroutine behind load_main: --sessions concurrent login-then-browse sessions until --duration"""
+    deadline = time.perf_counter() + args.duration
     
-    start_date = datetime.now() - timedelta(days=days)
-    statuses = ['present', 'absent', 'late', 'excused']
+    async def call(http, method: str, route: str, path: str, **kwargs):
+        endpoint = stats.setdefault(f"{method} {route}", {'latencies': [], 'errors': 0, 'throttled': 0, 'statuses': {}})
+        started = time.perf_counter()
+        try:
+            async with http.request(method, args.base_url + path, **kwargs) as response:
+                body = await response.read()
+                status = response.status
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            body, status = None, type(e).__name__
+        endpoint['statuses'][str(status)] = endpoint['statuses'].get(str(status), 0) + 1
+        if status == 429:
+            # The rate limiter answers without touching the database: keep these out of the latencies
+            endpoint['throttled'] += 1
+            return None
+        endpoint['latencies'].append(time.perf_counter() - started)
+        if not isinstance(status, int) or status >= 400:
+            endpoint['errors'] += 1
+            return None
+        return body
     
-    for student_id in student_ids:
-        for day in range(days):
-            if day % 7 in [5, 6]:
-                continue
-            
-            if random.random() < 0.1:
+    async def session(http, number: int):
+        rng = random.Random(derive_seed(args.seed, 'load', number))
+        while time.perf_counter() < deadline:
+            role = 'teacher' if rng.random() < args.teacher_share else 'student'
+            account = rng.choice(population[role])
+            body = await call(http, *LOAD_LOGIN_ROUTE, LOAD_LOGIN_ROUTE[1],
+                              json={'email': account['email'], 'password': args.account_password})
+            try:
+                token = json.loads(body)['data']['token'] if body else None
+            except (ValueError, KeyError, TypeError):
+                token = None
+            if token is None:
+                await asyncio.sleep(args.think_time / 1000)
                 continue
+            headers = {'Authorization': f"Bearer {token}"}
             
-            date = start_date + timedelta(days=day)
-            status = random.choices(statuses, weights=ATTENDANCE_WEIGHTS)[0]
-            
-            record = {
-                'student_id': student_id,
-                'course_id': None,
-                'date': date.date(),
-                'status': status,
-                'notes': fake.sentence() if status != 'present' and random.random() > 0.7 else None
-            }
-            attendance.append(record)
+            actions = LOAD_ACTIONS[role]
+            for _ in range(args.requests_per_session):
+                if time.perf_counter() >= deadline:
+                    return
+                _, method, route = rng.choices(actions, weights=[a[0] for a in actions])[0]
+                path = '/'.join(rng.choice(account[part[1:]]) if part.startswith(':') else part
+                                for part in route.split('/'))
+                params = {'limit': 20} if route == '/students' else None
+                await call(http, method, route, path, headers=headers, params=params)
+                if args.think_time:
+                    await asyncio.sleep(rng.expovariate(1000 / args.think_time))
     
-    print(f"✓ Generated {len(attendance)} attendance records")
-    return attendance
+    connector = aiohttp.TCPConnector(limit=args.connections)
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as http:
+        await asyncio.gather(*(session(http, i) for i in range(args.sessions)))
 
-def insert_attendance(conn, attendance: List[Dict[str, Any]]):
-    """Insert attendance records"""
-    cursor = conn.cursor()
+def load_main(argv: List[str]):
+    """load subcommand: replay teacher/student dashboard traffic against the API using the seeded accounts"""
+    parser = argparse.ArgumentParser(
+        prog='generate_mock_data.py load',
+        description='Drive the Express API with concurrent teacher and student sessions that log in with '
+                    'the seeded accounts and request their own courses, classes, grades and attendance. '
+                    'Pass the --seed/--students/--teachers (or --scenario) the database was seeded with.'
+    )
+    parser.add_argument('--base-url', default=LOAD_BASE_URL, help=f'API base URL (default: {LOAD_BASE_URL})')
+    parser.add_argument('--account-password', required=True,
+                        help='Password of the seeded accounts (they all share DEFAULT_PASSWORD_HASH)')
+    parser.add_argument('--students', type=int, default=100, help='Students seeded (default: 100)')
+    parser.add_argument('--teachers', type=int, default=20, help='Teachers seeded (default: 20)')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help=f'Seed used (default: {DEFAULT_SEED})')
+    parser.add_argument('--years', type=int, default=1,
+                        help='--years of a --workload timeseries seed (default: 1)')
+    parser.add_argument('--scenario', metavar='PATH', help='Scenario file used for seeding')
+    parser.add_argument('--sessions', type=int, default=50, help='Concurrent sessions (default: 50)')
+    parser.add_argument('--teacher-share', type=float, default=0.2,
+                        help='Fraction of sessions that log in as a teacher (default: 0.2)')
+    parser.add_argument('--requests-per-session', type=int, default=20,
+                        help='Requests after each login before the session logs in as another account (default: 20)')
+    parser.add_argument('--think-time', type=float, default=500,
+                        help='Mean pause between a session\'s requests in ms, exponentially distributed (default: 500)')
+    parser.add_argument('--duration', type=float, default=60, help='Seconds to run (default: 60)')
+    parser.add_argument('--connections', type=int, default=100,
+                        help='HTTP connection pool size shared by all sessions (default: 100)')
+    parser.add_argument('--timeout', type=float, default=30, help='Per-request timeout in seconds (default: 30)')
+    parser.add_argument('--results', metavar='PATH', help='Also write per-endpoint results as JSON')
     
-    values = [
-        (
-            a['student_id'],
-            a['course_id'],
-            a['date'],
-            a['status'],
-            a['notes']
-        )
-        for a in attendance
-    ]
+    args, scenario = parse_with_scenario(parser, argv)
+    if aiohttp is None:
+        print("Error: the load subcommand requires aiohttp")
+        print("Install with: pip install aiohttp")
+        sys.exit(1)
+    if args.students < 1 or args.teachers < 1:
+        print("Error: --students and --teachers must be at least 1")
+        sys.exit(1)
     
-    query = """
-        INSERT INTO attendance (student_id, course_id, date, status, notes)
-        VALUES %s
-    """
+    print("=" * 60)
+    print("AI SCHOOL DASHBOARD - API LOAD DRIVER")
+    print("=" * 60)
+    population = load_population(args)
+    print(f"⚡ {args.sessions} sessions ({args.teacher_share:.0%} teachers) against {args.base_url} "
+          f"for {args.duration:.0f}s over {args.connections} connections...")
     
-    execute_values(cursor, query, values)
-    cursor.close()
+    stats = {}
+    started = time.perf_counter()
+    asyncio.run(_drive_load(args, population, stats))
+    elapsed = time.perf_counter() - started
+    
+    endpoints = []
+    for name, endpoint in sorted(stats.items()):
+        latencies = sorted(endpoint['latencies'])
+        endpoints.append({
+            'endpoint': name,
+            'requests': len(latencies),
+            'errors': endpoint['errors'],
+            'throttled': endpoint['throttled'],
+            'statuses': endpoint['statuses'],
+            'rps': round(len(latencies) / elapsed, 1),
+            'latency_ms': {
+                'p50': _percentile(latencies, 0.50),
+                'p95': _percentile(latencies, 0.95),
+                'p99': _percentile(latencies, 0.99),
+                'max': _percentile(latencies, 1.0)
+            }
+        })
+    
+    print("\n" + "=" * 60)
+    print(f"📊 LOAD RESULTS ({elapsed:.1f}s)")
+    print("=" * 60)
+    print(f"{'Endpoint':<40}{'Requests':>9}{'Errors':>8}{'429s':>8}{'Req/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for endpoint in endpoints:
+        latency = endpoint['latency_ms']
+        print(f"{endpoint['endpoint']:<40}{endpoint['requests']:>9}{endpoint['errors']:>8}{endpoint['throttled']:>8}"
+              f"{endpoint['rps']:>8.1f}{latency['p50']:>9.1f}{latency['p95']:>9.1f}{latency['p99']:>9.1f}")
+    print("=" * 60)
+    total = sum(endpoint['requests'] for endpoint in endpoints)
+    errors = sum(endpoint['errors'] for endpoint in endpoints)
+    throttled = sum(endpoint['throttled'] for endpoint in endpoints)
+    print(f"{total} requests, {errors} errors, {throttled} rate-limited (429, not in the latencies), "
+          f"{total / elapsed:,.1f} req/s")
+    if throttled > LOAD_THROTTLED_SHARE * (total + throttled):
+        print(f"⚠ {throttled / (total + throttled):.0%} of requests were rate-limited, so throughput and latency "
+              "reflect the limiter, not the API. Start the API with NODE_ENV=test, where the limiter is skipped")
+    for endpoint in endpoints:
+        failed = {status: n for status, n in endpoint['statuses'].items()
+                  if not status.startswith(('2', '3')) and status != '429'}
+        if failed:
+            print(f"⚠ {endpoint['endpoint']}: " + ', '.join(f"{n} × {status}" for status, n in failed.items()))
+    
+    if args.results:
+        with open(args.results, 'w', encoding='utf-8') as f:
+            json.dump({
+                'generated_at': datetime.now().isoformat(timespec='seconds'),
+                'base_url': args.base_url,
+                'seed': args.seed,
+                'students': args.students,
+                'teachers': args.teachers,
+                'scenario': scenario.get('name', args.scenario) if scenario else None,
+                'sessions': args.sessions,
+                'teacher_share': args.teacher_share,
+                'duration_seconds': round(elapsed, 3),
+                'endpoints': endpoints
+            }, f, indent=2)
+        print(f"\n✓ Results written to {args.results}")
+
+def parse_with_scenario(parser, argv: List[str] = None) -> tuple:
+    """Parse arguments; with --scenario, re-parse using its [run] section as defaults and apply it
     
-    print(f"✓ Inserted {len(attendance)} attendance records into database")
+    Returns (args, scenario or None) and exits on an unreadable or invalid scenario.
+    """
+    args = parser.parse_args(argv)
+    scenario = None
+    if args.scenario:
+        try:
+            scenario = load_scenario(args.scenario)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        problems = validate_scenario(scenario)
+        if problems:
+            print(f"Error: invalid scenario {args.scenario}:")
+            for problem in problems:
+                print(f"   {problem}")
+            sys.exit(1)
+        parser.set_defaults(**scenario.get('run', {}))
+        args = parser.parse_args(argv)
+        apply_scenario(scenario)
+    return args, scenario
 
 def main():
     parser = argparse.ArgumentParser(description='Generate mock data for AI School Dashboard')
@@ -531,67 +3368,434 @@ def main():
     parser.add_argument('--dbname', default='school_dashboard', help='Database name')
     parser.add_argument('--user', default='postgres', help='Database user')
     parser.add_argument('--password', default='postgres', help='Database password')
-    parser.add_argument('--output', help='Output JSON file path (optional)')
+    parser.add_argument('--output', help='Write every table to files in this directory instead of the database')
+    parser.add_argument('--format', choices=EXPORT_FORMATS, default='ndjson',
+                        help='File format for --output (default: ndjson)')
+    parser.add_argument('--compress', choices=COMPRESSIONS, default='none',
+                        help='Compression for --output files (default: none)')
+    parser.add_argument('--from-dataset', metavar='DIR',
+                        help='Load a dataset written with --output into the database instead of generating')
+    parser.add_argument('--loader', choices=LOADERS, default='insert',
+                        help='Bulk load strategy: multi-row INSERT, COPY FROM STDIN, async (asyncpg binary '
+                             'COPY of grades/attendance, generated while earlier batches load), or upsert (COPY '
+                             'into a staging table, then INSERT ... ON CONFLICT DO NOTHING; rows that already '
+                             'exist are skipped; default: insert)')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                        help=f'Rows per grade/attendance batch (default: {BATCH_SIZE})')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED,
+                        help=f'Random seed; output is reproducible for a given seed (default: {DEFAULT_SEED})')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Worker processes for student/grade/attendance generation (default: 1)')
+    parser.add_argument('--engine', choices=ENGINES, default='python',
+                        help='Grade/attendance generator: per-row python or vectorized numpy (default: python)')
+    parser.add_argument('--faker-pool-size', type=int, default=0,
+                        help='Sample names/phones/addresses/sentences from seeded pools of this size '
+                             'instead of calling Faker per row (default: 0, disabled)')
+    parser.add_argument('--faker-pool-cache', metavar='PATH',
+                        help='JSON file to persist/reuse the Faker value pools')
+    parser.add_argument('--connections', type=int, default=1,
+                        help='Database connections for loading grades/attendance in parallel (default: 1)')
+    parser.add_argument('--fast-load', action='store_true',
+                        help='Drop secondary indexes and disable triggers while loading, then rebuild '
+                             'them (over --connections connections) and ANALYZE')
+    parser.add_argument('--workload', choices=WORKLOADS, default='snapshot',
+                        help='snapshot: --grades grades and --days of daily attendance ending today; '
+                             'timeseries: per-period attendance and scheduled exams for every school day '
+                             'of --years academic years, in date order (default: snapshot)')
+    parser.add_argument('--years', type=int, default=1,
+                        help=f'Academic years of history for --workload timeseries, ending with '
+                             f'{CURRENT_ACADEMIC_YEAR} (default: 1)')
+    parser.add_argument('--periods-per-day', type=int, default=PERIODS_PER_DAY,
+                        help=f'Timetabled periods per school day for --workload timeseries (default: {PERIODS_PER_DAY})')
+    parser.add_argument('--progress', action='store_true',
+                        help='Show a live rows/sec and ETA line on stderr while loading')
+    parser.add_argument('--report', metavar='PATH',
+                        help='Write a JSON timing report: per-phase wall/busy time, rows and batch latencies')
+    parser.add_argument('--profile', nargs='?', const='mock_data_profile', metavar='PREFIX',
+                        help='Run under cProfile and tracemalloc, writing PREFIX.pstats and '
+                             'PREFIX.tracemalloc.txt (default prefix: mock_data_profile)')
+    parser.add_argument('--append', action='store_true',
+                        help='Extend an existing database: --students/--teachers become totals and only '
+                             'the missing students, teachers, attendance days and --grades new grades are loaded')
+    parser.add_argument('--checkpoint', nargs='?', const=CHECKPOINT_FILE, metavar='PATH',
+                        help='Commit in chunks and record progress in PATH so an interrupted seed can be '
+                             f'resumed (default path: {CHECKPOINT_FILE})')
+    parser.add_argument('--checkpoint-every', type=int, default=CHECKPOINT_EVERY,
+                        help=f'Grade/attendance batches per commit with --checkpoint (default: {CHECKPOINT_EVERY})')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue a --checkpoint seed from its last committed chunk '
+                             '(same arguments; implies --checkpoint)')
+    parser.add_argument('--scenario', metavar='PATH',
+                        help='TOML (or YAML, with PyYAML) scenario: layout, distributions, catalog and '
+                             'defaults for these options (explicit options still win)')
+    parser.add_argument('--plan', action='store_true',
+                        help='Validate, print exact row counts and estimated size/load time, and exit')
+    parser.add_argument('--rollups', action='store_true',
+                        help='Also fill the rollup tables from database/migrations/002_create_rollups.sql, '
+                             'tallied while grades and attendance are generated')
+    parser.add_argument('--benchmark-results', metavar='PATH',
+                        help='benchmark results JSON whose measured rates/sizes --plan should use')
+    
+    args, scenario = parse_with_scenario(parser)
+    if args.resume and not args.checkpoint:
+        args.checkpoint = CHECKPOINT_FILE
+    
+    if args.engine == 'numpy' and np is None:
+        print("Error: --engine numpy requires numpy")
+        print("Install with: pip install numpy")
+        sys.exit(1)
+    if args.loader == 'async' and asyncpg is None:
+        print("Error: --loader async requires asyncpg")
+        print("Install with: pip install asyncpg")
+        sys.exit(1)
+    if args.compress == 'zstd' and zstandard is None:
+        print("Error: --compress zstd requires zstandard")
+        print("Install with: pip install zstandard")
+        sys.exit(1)
+    if args.format in COLUMNAR_FORMATS and pa is None:
+        print(f"Error: --format {args.format} requires pyarrow")
+        print("Install with: pip install pyarrow")
+        sys.exit(1)
+    
+    if args.fast_load and args.output:
+        print("Error: --fast-load applies to database loads, not --output")
+        sys.exit(1)
+    if args.rollups and (args.output or args.from_dataset):
+        print("Error: --rollups fills database tables; it cannot be combined with --output or --from-dataset")
+        sys.exit(1)
+    if args.fast_load and args.loader == 'upsert':
+        # idx_unique_daily_attendance is a plain unique index that --fast-load would drop
+        print("Error: --loader upsert needs every unique index to detect conflicts; drop --fast-load")
+        sys.exit(1)
+    if args.append and (args.output or args.from_dataset):
+        print("Error: --append extends a database; it cannot be combined with --output or --from-dataset")
+        sys.exit(1)
+    if args.append and args.workload == 'timeseries':
+        print("Error: --append only supports --workload snapshot")
+        sys.exit(1)
+    if args.checkpoint and (args.output or args.from_dataset or args.append):
+        print("Error: --checkpoint/--resume apply to fresh database seeds, not --output, --from-dataset or --append")
+        sys.exit(1)
+    if args.checkpoint and (args.connections > 1 or args.loader == 'async'):
+        print("Error: --checkpoint commits chunks over a single connection; drop --connections and --loader async")
+        sys.exit(1)
+    if args.checkpoint_every < 1:
+        print("Error: --checkpoint-every must be at least 1")
+        sys.exit(1)
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+    if args.years < 1:
+        parser.error("--years must be at least 1")
+    if args.periods_per_day < 1:
+        parser.error("--periods-per-day must be at least 1")
     
-    args = parser.parse_args()
+    if args.plan:
+        plan_main(args, scenario)
+        return
+    if args.from_dataset:
+        load_dataset_main(args)
+        return
     
     print("=" * 60)
     print("AI SCHOOL DASHBOARD - MOCK DATA GENERATOR (FIXED)")
     print("=" * 60)
     print(f"Generating data for {args.students} students and {args.teachers} teachers...")
+    print(f"Seed: {args.seed}, workers: {args.workers}, engine: {args.engine}, workload: {args.workload}")
     print()
     
+    checkpoint = None
+    if args.checkpoint:
+        checkpoint = Checkpoint(args.checkpoint, {key: getattr(args, key) for key in CHECKPOINT_SETTINGS},
+                                args.checkpoint_every)
+        if args.resume:
+            if not os.path.exists(args.checkpoint):
+                print(f"Error: no checkpoint at {args.checkpoint}; nothing to resume")
+                sys.exit(1)
+            try:
+                checkpoint.resume()
+            except ValueError as e:
+                print(f"Error: {e}")
+                sys.exit(1)
+            print()
+        elif os.path.exists(args.checkpoint):
+            print(f"Error: {args.checkpoint} holds an unfinished seed; "
+                  "pass --resume to continue it or delete the file to start over")
+            sys.exit(1)
+    # Every relative date (exam windows, attendance history, timeseries calendar) is
+    # computed from this day, so a resumed seed regenerates the same rows
+    today = checkpoint.today if checkpoint else date.today()
+    
+    profiler = start_profiling(args)
+    marks = None
+    if args.append:
+        print("🔌 Reading high-water marks for --append...")
+        conn = connect_db(args)
+        try:
+            marks = read_high_water_marks(conn)
+        finally:
+            conn.close()
+        print()
+    
     # Generate data
     print("📊 Generating mock data...")
-    admin = generate_admin_user()
-    teachers = generate_teachers(args.teachers)
-    classes = generate_classes(args.teachers)
-    students = generate_students(args.students, len(classes))
+    if args.faker_pool_size > 0:
+        install_value_pools(build_value_pools(args.seed, args.faker_pool_size, args.faker_pool_cache))
+    admin = generate_admin_user(args.seed)
+    seed_generators(args.seed, 'teachers')
+    teachers = generate_teachers(args.teachers, args.seed, marks['teachers'] if marks else 0)
+    
+    # IDs are generated client-side, so every table is ready before the first insert;
+    # --append keeps the classes and courses already in the database. Students
+    # join current-year classes; earlier years only exist for the timeseries history.
+    teacher_ids = (marks['teacher_ids'] if marks else []) + [t.id for t in teachers]
+    free_seats = None
+    if marks and marks['class_ids']:
+        # Add the sections a fresh run would have for the grown enrollment, then seat
+        # the new students in free places only, so no class goes past max_students
+        seed_generators(args.seed, 'classes')
+        layout = generate_classes(len(teacher_ids), args.seed, 1,
+                                  marks['enrolled'] + max(0, args.students - marks['students']))
+        problems = capacity_problems(layout)
+        if problems:
+            print(f"Error: {problems[0]}; use fewer schools/sections or --plan to check a scenario")
+            sys.exit(1)
+        # Existing classes may come from another seed, so added ones are keyed by name and
+        # take their homeroom teacher from the teachers actually in the database
+        seed_generators(args.seed, 'append-classes', marks['students'])
+        classes = [
+            c._replace(id=entity_uuid(args.seed, 'classes', f"{c.academic_year}/{c.name}"),
+                       teacher_id=random.choice(teacher_ids) if teacher_ids else None)
+            for c in layout if c.name not in marks['class_names']
+        ]
+        free_seats = {**marks['free_seats'], **{c.id: c.max_students for c in classes}}
+        class_ids = list(free_seats)
+        print(f"✓ Adding {len(classes)} classes; {sum(free_seats.values())} free seats")
+    else:
+        seed_generators(args.seed, 'classes')
+        classes = generate_classes(args.teachers, args.seed, args.years if args.workload == 'timeseries' else 1,
+                                   args.students)
+        class_ids = [c.id for c in classes if c.academic_year == CURRENT_ACADEMIC_YEAR]
+        problems = capacity_problems(classes)
+        if problems:
+            print(f"Error: {problems[0]}; use fewer schools/sections or --plan to check a scenario")
+            sys.exit(1)
+    students = generate_students(args.students, args.seed, args.workers, marks['students'] if marks else 0)
+    if free_seats is not None and len(students) > sum(free_seats.values()):
+        print(f"Error: {len(students)} new students but only {sum(free_seats.values())} free seats in "
+              f"{CURRENT_ACADEMIC_YEAR} classes; the existing classes do not match this run's layout")
+        sys.exit(1)
+    
+    if marks and marks['course_ids']:
+        # Keyed by their (unique) code, like the added classes by name
+        seed_generators(args.seed, 'append-courses', marks['students'])
+        courses = [
+            c._replace(id=entity_uuid(args.seed, 'courses', c.code))
+            for c in generate_courses([c.id for c in classes], teacher_ids, args.seed,
+                                      taken_codes=marks['course_codes'])
+        ]
+    else:
+        seed_generators(args.seed, 'courses')
+        courses = generate_courses([c.id for c in classes], teacher_ids, args.seed,
+                                   {c.id: c.academic_year for c in classes})
     
-    all_users = [admin] + [t['user'] for t in teachers] + [s['user'] for s in students]
+    all_users = (
+        ([] if marks and marks['admin'] else [admin])
+        + generate_users('teacher', args.teachers, args.seed, marks['teachers'] if marks else 0)
+        + generate_users('student', args.students, args.seed, marks['students'] if marks else 0)
+    )
+    
+    def connect():
+        return connect_db(args)
     
     # Connect to database
     conn = None
+    seeded = None  # (user_ids, class_ids) once parent tables are committed early
+    fast_load = None
     try:
-        print("\n🔌 Connecting to database...")
-        conn = psycopg2.connect(
-            host=args.host,
-            port=args.port,
-            dbname=args.dbname,
-            user=args.user,
-            password=args.password
-        )
-        conn.autocommit = False
-        print("✓ Connected to database successfully")
+        if args.output:
+            print(f"\n📁 Writing dataset to {args.output} ({args.format}, compression: {args.compress})...")
+            conn = DatasetWriter(args.output, args.format, args.compress, metadata={
+                'seed': args.seed,
+                'students': args.students,
+                'teachers': args.teachers,
+                'grades': args.grades,
+                'days': args.days,
+                'engine': args.engine,
+                'workload': args.workload,
+                'years': args.years,
+                'scenario': scenario.get('name', args.scenario) if scenario else None,
+                'generated_at': datetime.now().isoformat(timespec='seconds')
+            })
+        else:
+            print("\n🔌 Connecting to database...")
+            conn = connect()
+            print("✓ Connected to database successfully")
+            
+            if args.rollups:
+                cursor = conn.cursor()
+                cursor.execute("SELECT to_regclass(%s)", (next(iter(ROLLUPS)),))
+                if cursor.fetchone()[0] is None:
+                    print("Error: --rollups needs the rollup tables; run database/migrations/002_create_rollups.sql")
+                    sys.exit(1)
+                cursor.close()
+            
+            if args.fast_load:
+                fast_load = FastLoad(connect, TABLE_ORDER, args.connections)
+                fast_load.prepare()
+            
+            print(f"\n💾 Inserting data into database (loader: {args.loader})...")
+        
+        if free_seats is not None:
+            assign_free_seats(students, free_seats)
+        else:
+            assign_classes(students, class_ids)
+        student_ids = [s.id for s in students]
+        course_ids = (marks['course_ids'] if marks else []) + [c.id for c in courses]
+        parent_counts = {
+            'users': len(all_users),
+            'teachers': len(teachers),
+            'classes': len(classes),
+            'students': len(students),
+            'courses': len(courses)
+        }
+        if checkpoint and args.resume:
+            checkpoint.reconcile(conn, student_ids, parent_counts)
+        elif checkpoint:
+            # Written before the first commit, so a crash right after it can still be resumed
+            checkpoint.save()
         
-        print("\n💾 Inserting data into database...")
+        if checkpoint and checkpoint.complete('courses'):
+            print("⏭ Skipping users, teachers, classes, students and courses: already committed")
+        else:
+            insert_users(conn, all_users, args.loader)
+            insert_teachers(conn, teachers, args.loader)
+            if classes:
+                insert_classes(conn, classes, args.loader)
+            insert_students(conn, students, args.loader)
+            if courses:
+                insert_courses(conn, courses, args.loader)
+            if checkpoint:
+                checkpoint.commit(conn, {table: (1, rows) for table, rows in parent_counts.items()}, complete=True)
         
-        email_to_id = insert_users(conn, all_users)
-        teacher_ids = insert_teachers(conn, teachers, email_to_id)
-        class_ids = insert_classes(conn, classes, teacher_ids)
-        student_ids = insert_students(conn, students, email_to_id, class_ids)
-        course_ids = insert_courses(conn, generate_courses(class_ids, teacher_ids))
+        # Grades and attendance stream straight from the generators in fixed-size batches
+        if args.workload == 'timeseries':
+            # Both streams are date-ordered so the rows land physically clustered by date
+            plan = plan_timeseries(classes, courses, students, args.seed, args.periods_per_day, today)
+            instruments.expect('insert_grades', sum(
+                len(student_ids) * len(exams) for _, sessions in plan for student_ids, _, _, exams in sessions
+            ))
+            instruments.expect('insert_attendance', sum(
+                len(student_ids) * len(periods) for _, sessions in plan for student_ids, _, periods, _ in sessions
+            ))
+            grade_batches = generate_timeseries_grades(plan, args.batch_size, args.seed, args.workers, args.engine)
+            attendance_batches = generate_timeseries_attendance(
+                plan, args.batch_size, args.seed, args.workers, args.engine
+            )
+        elif marks:
+            # Each delta gets its own seed so repeated appends don't replay the same rows;
+            # new grades go to the new students (all students when none were added) and
+            # existing students get attendance for the days since the last recorded one
+            delta_seed = derive_seed(args.seed, 'append', marks['students'], marks['attendance_until'])
+            grade_batches = generate_grades(
+                student_ids or marks['student_ids'], course_ids, args.grades, args.batch_size,
+                delta_seed, args.workers, args.engine
+            )
+            if marks['attendance_until']:
+                since = datetime.combine(marks['attendance_until'], datetime.min.time()) + timedelta(days=1)
+                catch_up_days = max(0, (datetime.now() - since).days)
+            else:
+                since, catch_up_days = None, args.days
+            attendance_batches = chain(
+                generate_attendance(marks['student_ids'], catch_up_days, args.batch_size,
+                                    delta_seed, args.workers, args.engine, since),
+                generate_attendance(student_ids, args.days, args.batch_size,
+                                    derive_seed(delta_seed, 'new'), args.workers, args.engine)
+            )
+        else:
+            # Weekdays only, ~10% of days skipped
+            instruments.expect('insert_grades', args.grades)
+            instruments.expect('insert_attendance', len(student_ids) * args.days * 5 / 7 * 0.9)
+            grade_batches = generate_grades(
+                student_ids, course_ids, args.grades, args.batch_size, args.seed, args.workers, args.engine, today
+            )
+            attendance_batches = generate_attendance(
+                student_ids, args.days, args.batch_size, args.seed, args.workers, args.engine,
+                datetime.combine(today, datetime.min.time()) - timedelta(days=args.days)
+            )
+        
+        # Tallies only cover rows this run generates and loads in full; appends, upserts
+        # (which may skip rows) and resumed seeds recompute the rollups from the tables instead
+        rollups = None
+        if args.rollups and not marks and args.loader != 'upsert' and not (checkpoint and checkpoint.resumed):
+            rollups = Rollups({s.id: s.class_id for s in students})
+            grade_batches = rollups.grades(grade_batches)
+            attendance_batches = rollups.attendance(attendance_batches)
         
-        grades = generate_grades(student_ids, course_ids, args.grades)
-        insert_grades(conn, grades)
+        if checkpoint:
+            grade_batches = checkpoint.batches(conn, 'grades', grade_batches)
+            attendance_batches = checkpoint.batches(conn, 'attendance', attendance_batches)
         
-        attendance = generate_attendance(student_ids, args.days)
-        insert_attendance(conn, attendance)
+        if (args.connections > 1 or args.loader == 'async') and not args.output:
+            # Loader connections must see the parent rows, so commit them first. Upserted
+            # parents may have existed before this run, so those are never cleaned up
+            conn.commit()
+            if args.loader != 'upsert':
+                seeded = ([u.id for u in all_users], [c.id for c in classes])
+            streams = [
+                ('grades', GRADE_COLUMNS, grade_batches),
+                ('attendance', ATTENDANCE_COLUMNS, attendance_batches)
+            ]
+            if args.loader == 'async':
+                counts = load_async({
+                    'host': args.host,
+                    'port': int(args.port),
+                    'database': args.dbname,
+                    'user': args.user,
+                    'password': args.password
+                }, streams, args.connections)
+            else:
+                counts = load_parallel(connect, streams, args.connections, args.loader)
+            grade_count, attendance_count = counts['grades'], counts['attendance']
+        else:
+            grade_count = insert_grades(conn, grade_batches, args.loader)
+            attendance_count = insert_attendance(conn, attendance_batches, args.loader)
         
+        if rollups:
+            insert_rollups(conn, rollups, args.loader)
+        elif args.rollups:
+            refresh_rollups(conn)
         conn.commit()
-        print("\n✅ All data inserted successfully!")
+        if checkpoint:
+            grade_count += checkpoint.resumed.get('grades', 0)
+            attendance_count += checkpoint.resumed.get('attendance', 0)
+            checkpoint.remove()
+        if fast_load:
+            # A failed rebuild (e.g. a unique index) removes this run's rows again
+            seeded = ([u.id for u in all_users], [c.id for c in classes])
+            fast_load.restore()
+        if args.output:
+            print(f"\n✅ All data written to {args.output}!")
+        else:
+            print("\n✅ All data inserted successfully!")
         
         print("\n" + "=" * 60)
-        print("📈 SUMMARY")
+        print("📈 SUMMARY" + (" (appended rows)" if marks else ""))
         print("=" * 60)
         print(f"Users:      {len(all_users)}")
         print(f"Teachers:   {len(teachers)}")
         print(f"Classes:    {len(classes)}")
         print(f"Students:   {len(students)}")
-        print(f"Courses:    {len(course_ids)}")
-        print(f"Grades:     {len(grades)}")
-        print(f"Attendance: {len(attendance)}")
+        print(f"Courses:    {len(courses)}")
+        print(f"Grades:     {grade_count}")
+        print(f"Attendance: {attendance_count}")
         print("=" * 60)
+        if upsert_counts:
+            print("Upsert: inserted / skipped (already present or orphaned)")
+            for table in TABLE_ORDER:
+                if table in upsert_counts:
+                    inserted, skipped = upsert_counts[table]
+                    print(f"  {table:<12}{inserted:>10} / {skipped}")
+            print("=" * 60)
         
         print("\n🎉 Mock data generation completed successfully!")
         print("\n🔑 Default login credentials:")
@@ -603,13 +3807,29 @@ def main():
         print(f"\n❌ Error: {e}")
         if conn:
             conn.rollback()
+            if seeded:
+                cleanup_seeded_rows(conn, *seeded)
+        if checkpoint and os.path.exists(checkpoint.path):
+            print(f"💾 Committed chunks are recorded in {checkpoint.path}; rerun with --resume to continue")
         import traceback
         traceback.print_exc()
         sys.exit(1)
     finally:
+        # Close first: an interrupted load still holds locks that would block the index rebuild
         if conn:
             conn.close()
-            print("\n🔌 Database connection closed")
+            if not args.output:
+                print("\n🔌 Database connection closed")
+        if fast_load:
+            fast_load.finish()
+        finish_instrumentation(args, profiler)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    if sys.argv[1:2] == ['benchmark']:
+        benchmark_main(sys.argv[2:])
+    elif sys.argv[1:2] in (['snapshot'], ['restore']):
+        snapshot_main(sys.argv[2:], sys.argv[1])
+    elif sys.argv[1:2] == ['load']:
+        load_main(sys.argv[2:])
+    else:
+        main()
\ No newline at end of file
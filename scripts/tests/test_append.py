@@ -0,0 +1,28 @@
+"""--append helpers: seating new students in free places and skipping course codes in use"""
+
+from collections import Counter
+from itertools import islice
+
+import generate_mock_data as g
+
+
+def student_rows(count):
+    return [g.StudentRow(*([f"s{i}"] + [None] * (len(g.StudentRow._fields) - 1))) for i in range(count)]
+
+
+def test_assign_free_seats_fills_evenly_within_free_seats():
+    students = student_rows(9)
+    free_seats = {'a': 2, 'b': 0, 'c': 10, 'd': 4}
+    g.assign_free_seats(students, free_seats)
+    sizes = Counter(s.class_id for s in students)
+    assert all(sizes[class_id] <= free for class_id, free in free_seats.items())
+    # Each student goes where the most seats are free, which levels them out: a, c and d keep 2, 2 and 3
+    assert sizes == {'c': 8, 'd': 1}
+
+
+def test_generate_courses_skips_taken_codes():
+    taken = set(islice(g.course_codes(42, 'MATH'), 50))
+    g.seed_generators(42, 'courses')
+    courses = g.generate_courses([f"c{i}" for i in range(20)], ['t1'], 42, taken_codes=taken)
+    assert courses
+    assert not taken & {c.code for c in courses}
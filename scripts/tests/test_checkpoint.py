@@ -0,0 +1,47 @@
+"""--checkpoint-every/--resume: committed batches are skipped, the rest are loaded once"""
+
+import pytest
+
+import generate_mock_data as g
+
+
+class Conn:
+    """Stand-in connection counting commits"""
+    
+    def __init__(self):
+        self.commits = 0
+    
+    def commit(self):
+        self.commits += 1
+
+
+BATCHES = [[(i, j) for j in range(10)] for i in range(10)]
+
+
+def test_resume_skips_committed_batches(tmp_path):
+    path = str(tmp_path / 'ck.json')
+    conn = Conn()
+    checkpoint = g.Checkpoint(path, {'seed': 42}, every=2)
+    loaded = []
+    for batch in checkpoint.batches(conn, 'grades', BATCHES):
+        loaded.append(batch)
+        if len(loaded) == 5:
+            break  # crash while loading batch 5: batches 1-4 are committed
+    assert conn.commits == 2
+    
+    resumed = g.Checkpoint(path, {'seed': 42}, every=2)
+    resumed.resume()
+    assert resumed.resumed == {'grades': 40}
+    assert list(resumed.batches(conn, 'grades', BATCHES)) == BATCHES[4:]
+    assert resumed.state['tables']['grades'] == {'batches': 10, 'rows': 100, 'complete': True}
+    
+    again = g.Checkpoint(path, {'seed': 42}, every=2)
+    again.resume()
+    assert list(again.batches(conn, 'grades', BATCHES)) == []
+
+
+def test_resume_rejects_other_settings(tmp_path):
+    path = str(tmp_path / 'ck.json')
+    g.Checkpoint(path, {'seed': 42}, every=2).save()
+    with pytest.raises(ValueError, match='--seed 42'):
+        g.Checkpoint(path, {'seed': 43}, every=2).resume()
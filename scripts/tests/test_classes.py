@@ -0,0 +1,31 @@
+"""Class layout and balanced class assignment (generate_classes, assign_classes)"""
+
+from collections import Counter
+
+import pytest
+
+import generate_mock_data as g
+
+
+def student_rows(count):
+    return [g.StudentRow(*([f"s{i}"] + [None] * (len(g.StudentRow._fields) - 1))) for i in range(count)]
+
+
+@pytest.mark.parametrize('student_count', [1, 7, 100, 1000, 5000, 20000])
+def test_assign_classes_keeps_every_class_within_capacity(student_count):
+    g.seed_generators(42, 'classes')
+    classes = g.generate_classes(20, 42, 1, student_count)
+    students = student_rows(student_count)
+    g.assign_classes(students, [c.id for c in classes])
+    sizes = Counter(s.class_id for s in students)
+    assert sum(sizes.values()) == student_count
+    assert all(sizes[c.id] <= c.max_students for c in classes)
+    assert max(sizes.values()) - min(sizes[c.id] for c in classes) <= 1
+
+
+def test_generate_classes_deals_every_teacher_a_homeroom():
+    g.seed_generators(42, 'classes')
+    classes = g.generate_classes(20, 42, 1, 0)
+    homerooms = Counter(c.teacher_id for c in classes)
+    assert len(homerooms) == min(20, len(classes))
+    assert max(homerooms.values()) - min(homerooms.values()) <= 1
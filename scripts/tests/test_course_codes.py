@@ -0,0 +1,28 @@
+"""Course code allocation (course_codes, generate_courses) and subject code validation"""
+
+from itertools import islice
+
+import generate_mock_data as g
+
+
+SUBJECTS = [[f"SUB{c}", f"Subject {c}"] for c in 'ABCDEFGH']
+
+
+def test_course_codes_stay_unique_past_900():
+    codes = list(islice(g.course_codes(42, 'MATH'), 5000))
+    assert len(set(codes)) == len(codes)
+    assert all(len(code) == len('MATH') + 3 for code in codes[:900])
+    assert all(len(code) <= g.COURSE_CODE_LENGTH for code in codes)
+
+
+def test_generate_courses_codes_unique_across_many_classes():
+    g.seed_generators(42, 'courses')
+    courses = g.generate_courses([f"c{i}" for i in range(600)], ['t1', 't2'], 42)
+    assert len(courses) > 900 * 2
+    assert len({c.code for c in courses}) == len(courses)
+
+
+def test_validate_scenario_rejects_subject_codes_ending_in_a_digit():
+    # PE1 + 100 and PE + 1100 would both be PE1100
+    assert g.validate_scenario({'catalog': {'subjects': SUBJECTS + [['PE1', 'Physical Education']]}})
+    assert g.validate_scenario({'catalog': {'subjects': SUBJECTS + [['PE', 'Physical Education']]}}) == []
@@ -0,0 +1,109 @@
+"""Dataset export (DatasetWriter) and reload (load_dataset) round trips"""
+
+import csv
+import io
+import re
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+import generate_mock_data as g
+
+
+class CopyRecorder:
+    """Connection stand-in that decodes what COPY ... FROM STDIN receives into rows of text values"""
+    
+    def __init__(self):
+        self.tables = {}
+        self.rowcount = 0
+    
+    def cursor(self):
+        return self
+    
+    def copy_expert(self, statement, f):
+        table, columns, fmt = re.match(r"COPY (\w+) \(([^)]*)\) FROM STDIN(?: WITH \(FORMAT (\w+)\))?",
+                                       statement).groups()
+        data = f.read()
+        data = data.decode('utf-8') if isinstance(data, bytes) else data
+        if fmt == 'csv':
+            rows = [[value or None for value in row] for row in csv.reader(io.StringIO(data))]
+        else:
+            escapes = {'n': '\n', 't': '\t', 'r': '\r', '\\': '\\'}
+            rows = [
+                [None if value == '\\N' else re.sub(r'\\(.)', lambda m: escapes[m.group(1)], value)
+                 for value in line.split('\t')]
+                for line in data.split('\n') if line
+            ]
+        self.tables.setdefault(table, []).extend(dict(zip(columns.split(', '), row)) for row in rows)
+        self.rowcount = len(rows)
+    
+    def close(self):
+        pass
+
+
+def normalize(column, value):
+    """Compare values the way PostgreSQL would store them, whatever the file format"""
+    if value is None:
+        return None
+    kind = g.ARROW_COLUMN_TYPES.get(column, 'string')
+    if kind == 'bool':
+        return value in (True, 't', 'true')
+    if kind == 'int':
+        return int(value)
+    if kind in ('grade', 'weight'):
+        return Decimal(str(value)).quantize(Decimal('0.01'))
+    if kind == 'date':
+        return str(value)[:10]
+    return str(value)
+
+
+def round_trip(tmp_path, fmt, compression):
+    """Export students, grades and attendance, reload them; return (expected, reloaded) per table"""
+    g.seed_generators(42, 'students')
+    students = g.generate_students(60, 42)
+    student_ids = [s.id for s in students]
+    course_ids = [g.entity_uuid(42, 'courses', i) for i in range(1, 21)]
+    tables = {
+        'students': (g.StudentRow._fields, [students]),
+        'grades': (g.GRADE_COLUMNS, list(g.generate_grades(student_ids, course_ids, 500, 128, 42,
+                                                           today=date(2024, 10, 1)))),
+        'attendance': (g.ATTENDANCE_COLUMNS, list(g.generate_attendance(student_ids, 5, 128, 42)))
+    }
+    writer = g.DatasetWriter(str(tmp_path), fmt, compression)
+    for table, (columns, batches) in tables.items():
+        for batch in batches:
+            writer.write(table, columns, batch)
+    writer.commit()
+    writer.close()
+    
+    conn = CopyRecorder()
+    counts = g.load_dataset(conn, str(tmp_path), batch_size=100)
+    expected = {
+        table: [{c: normalize(c, v) for c, v in zip(columns, row)}
+                for batch in batches for row in g.batch_rows(batch, columns)]
+        for table, (columns, batches) in tables.items()
+    }
+    reloaded = {
+        table: [{c: normalize(c, v) for c, v in row.items()} for row in rows]
+        for table, rows in conn.tables.items()
+    }
+    assert counts == {table: len(rows) for table, rows in expected.items()}
+    return expected, reloaded
+
+
+@pytest.mark.parametrize('fmt', ['ndjson', 'csv'])
+@pytest.mark.parametrize('compression', [
+    'none', 'gzip',
+    pytest.param('zstd', marks=pytest.mark.skipif(g.zstandard is None, reason='zstandard not installed'))
+])
+def test_text_dataset_round_trip(tmp_path, fmt, compression):
+    expected, reloaded = round_trip(tmp_path, fmt, compression)
+    assert reloaded == expected
+
+
+@pytest.mark.skipif(g.pa is None, reason='pyarrow not installed')
+@pytest.mark.parametrize('fmt,compression', [('parquet', 'none'), ('parquet', 'zstd'), ('arrow', 'none')])
+def test_columnar_dataset_round_trip(tmp_path, fmt, compression):
+    expected, reloaded = round_trip(tmp_path, fmt, compression)
+    assert reloaded == expected
@@ -0,0 +1,55 @@
+"""Pooled Faker values (--faker-pool-size): seeded, cacheable and the same in every worker"""
+
+import pytest
+
+import generate_mock_data as g
+
+
+@pytest.fixture
+def pooled(monkeypatch):
+    """Install 100-value pools for one test; the plain Faker and WORKER_SETTINGS come back afterwards"""
+    monkeypatch.setattr(g, 'fake', g.fake)
+    monkeypatch.setattr(g, 'WORKER_SETTINGS', {})
+    pools = g.build_value_pools(42, 100)
+    g.install_value_pools(pools)
+    return pools
+
+
+def test_build_value_pools_is_seeded(tmp_path):
+    pools = g.build_value_pools(42, 100)
+    assert pools == g.build_value_pools(42, 100)
+    assert pools != g.build_value_pools(43, 100)
+    assert sorted(pools) == sorted(g.POOLED_FAKER_FIELDS)
+    assert all(len(values) == 100 for values in pools.values())
+    
+    cache = str(tmp_path / 'pools.json')
+    assert g.build_value_pools(42, 100, cache) == pools
+    assert g.build_value_pools(42, 100, cache) == pools  # from the cache this time
+
+
+def test_pooled_faker_is_deterministic_per_seed(pooled):
+    def draw(seed):
+        g.seed_generators(seed, 'students', 0)
+        return [(g.fake.first_name(), g.fake.address(), g.fake.date_of_birth()) for _ in range(50)]
+    
+    first = draw(42)
+    assert first == draw(42)
+    assert first != draw(43)
+    assert {name for name, _, _ in first} <= set(pooled['first_name'])
+
+
+def test_pooled_students_identical_across_workers(pooled):
+    students = g.generate_students(1200, 42, 1)
+    assert students == g.generate_students(1200, 42, 2)
+    assert {s.first_name for s in students} <= set(pooled['first_name'])
+
+
+def test_init_worker_installs_the_pools(pooled, monkeypatch):
+    # A spawn/forkserver worker starts from the plain module-level Faker
+    monkeypatch.setattr(g, 'fake', g.fake.faker)
+    g.init_worker(dict(g.WORKER_SETTINGS))
+    assert isinstance(g.fake, g.PooledFaker)
+    assert g.fake.pools is pooled
+    # Re-installing in a forked worker wraps the Faker, not the PooledFaker
+    g.init_worker(dict(g.WORKER_SETTINGS))
+    assert not isinstance(g.fake.faker, g.PooledFaker)
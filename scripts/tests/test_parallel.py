@@ -0,0 +1,89 @@
+"""Sharded generation: same output whatever the --workers count, shards bounded in rows"""
+
+from datetime import date, datetime
+
+import pytest
+
+import generate_mock_data as g
+
+
+ENGINES = ['python', pytest.param('numpy', marks=pytest.mark.skipif(g.np is None, reason='numpy not installed'))]
+STUDENT_IDS = [g.entity_uuid(42, 'students', i) for i in range(1, 1201)]
+COURSE_IDS = [g.entity_uuid(42, 'courses', i) for i in range(1, 101)]
+
+
+def flatten(batches, columns):
+    return [row for batch in batches for row in g.batch_rows(batch, columns)]
+
+
+def test_students_identical_across_workers():
+    assert g.generate_students(1200, 42, 1) == g.generate_students(1200, 42, 2)
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_grades_identical_across_workers(engine):
+    runs = [
+        flatten(g.generate_grades(STUDENT_IDS, COURSE_IDS, 30000, 1000, 42, workers, engine, date(2024, 10, 1)),
+                g.GRADE_COLUMNS)
+        for workers in (1, 2)
+    ]
+    assert len(runs[0]) == 30000
+    assert runs[0] == runs[1]
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_attendance_identical_across_workers(engine):
+    runs = [
+        flatten(g.generate_attendance(STUDENT_IDS, 30, 1000, 42, workers, engine, datetime(2024, 9, 1)),
+                g.ATTENDANCE_COLUMNS)
+        for workers in (1, 2)
+    ]
+    assert runs[0]
+    assert runs[0] == runs[1]
+
+
+@pytest.mark.parametrize('rows_per_student', [1, 40, 90, 3600, 10 ** 6])
+def test_shards_are_bounded_in_rows(rows_per_student):
+    shard_size = g.rows_shard_size(rows_per_student)
+    assert 1 <= shard_size <= g.SHARD_SIZE
+    assert shard_size * rows_per_student <= max(g.SHARD_ROWS, rows_per_student)
+
+
+def test_split_sessions_keeps_order_and_bounds_parts():
+    sessions = [(f"s{i}", 7000) for i in range(20)]
+    parts = list(g.split_sessions(sessions, lambda session: session[1]))
+    assert [session for part in parts for session in part] == sessions
+    assert all(sum(session[1] for session in part) <= g.SHARD_ROWS for part in parts)
+
+
+@pytest.mark.skipif(g.np is None, reason='numpy not installed')
+@pytest.mark.parametrize('population', [8, 10, 64, 65, 100, 100000])
+def test_distinct_picks_are_distinct_and_in_range(population):
+    k = min(10, population)
+    picks = g._distinct_picks(g.np.random.default_rng(1), 500, population, k)
+    assert picks.shape == (500, k)
+    assert all(len(set(row)) == k for row in picks.tolist())
+    assert 0 <= picks.min() and picks.max() < population
+
+
+def timeseries_plan():
+    """A one-year --workload timeseries calendar for 60 students, as plan_seed() lays it out"""
+    g.seed_generators(42, 'classes')
+    classes = g.generate_classes(20, 42, 1, 60)
+    teacher_ids = [g.entity_uuid(42, 'teachers', i + 1) for i in range(20)]
+    g.seed_generators(42, 'students')
+    students = g.generate_students(60, 42)
+    g.assign_classes(students, [c.id for c in classes if c.academic_year == g.CURRENT_ACADEMIC_YEAR])
+    g.seed_generators(42, 'courses')
+    courses = g.generate_courses([c.id for c in classes], teacher_ids, 42, {c.id: c.academic_year for c in classes})
+    return g.plan_timeseries(classes, courses, students, 42, 5, date(2024, 10, 1))
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_timeseries_identical_across_workers(engine):
+    plan = timeseries_plan()
+    for generate, columns in ((g.generate_timeseries_grades, g.GRADE_COLUMNS),
+                              (g.generate_timeseries_attendance, g.ATTENDANCE_COLUMNS)):
+        runs = [flatten(generate(plan, 100, 42, workers, engine), columns) for workers in (1, 2)]
+        assert runs[0]
+        assert runs[0] == runs[1]
@@ -0,0 +1,40 @@
+"""Rollup tallies (Rollups) against the arithmetic of the raw-scan views"""
+
+from datetime import date
+from decimal import Decimal
+
+import generate_mock_data as g
+
+
+def test_rollups_rows_arithmetic():
+    day1, day2 = date(2024, 9, 9), date(2024, 9, 10)
+    rollups = g.Rollups({'s1': 'k1', 's2': 'k1', 's3': 'k2'})
+    grades = [
+        ('s1', 'c1', 8.24, 'midterm', day1, 1.0, None),
+        ('s1', 'c1', 8.25, 'final', day1, 1.0, None),
+        ('s2', 'c1', 7.25, 'quiz', day1, 0.5, None),
+        ('s2', 'c1', 10.0, 'final', day2, 2.0, None),
+    ]
+    attendance = [
+        ('s1', 'c1', day1, 'present', None),
+        ('s2', 'c1', day1, 'late', None),
+        ('s3', 'c2', day1, 'excused', None),
+        ('s1', 'c1', day2, 'absent', None),
+    ]
+    # Tallying passes the batches through unchanged
+    assert list(rollups.grades([grades[:2], grades[2:]])) == [grades[:2], grades[2:]]
+    assert list(rollups.attendance([attendance])) == [attendance]
+    rows = rollups.rows()
+    
+    assert sorted(rows['rollup_student_course_scores']) == [
+        # (8.24 + 8.25) / 2 = 8.245 rounds half up, like NUMERIC ROUND()
+        ('s1', 'c1', 2, Decimal('2.00'), Decimal('16.49'), Decimal('8.25')),
+        # (7.25 * 0.5 + 10 * 2) / 2.5 = 9.45
+        ('s2', 'c1', 2, Decimal('2.50'), Decimal('23.625'), Decimal('9.45')),
+    ]
+    assert sorted(rows['rollup_class_daily_attendance']) == [
+        ('k1', day1, 1, 0, 1, 0, 2),
+        ('k1', day2, 0, 1, 0, 0, 1),
+        ('k2', day1, 0, 0, 0, 1, 1),
+    ]
+    assert sorted(rows['rollup_course_grade_histogram']) == [('c1', 7, 1), ('c1', 8, 2), ('c1', 10, 1)]
@@ -0,0 +1,56 @@
+"""Scenario file validation (validate_scenario) and worker setup (init_worker)"""
+
+import copy
+import os
+
+import pytest
+
+import generate_mock_data as g
+
+
+SUBJECTS = [[f"SUB{c}", f"Subject {c}"] for c in 'ABCDEFGH']
+SCENARIO_DIR = os.path.join(os.path.dirname(g.__file__), 'scenarios')
+
+
+@pytest.mark.parametrize('scenario', [
+    {'unknown': {}},
+    {'run': {'loader': 'carrier-pigeon'}},
+    {'run': {'students': -1}},
+    {'run': {'batch_size': 0}},
+    {'run': {'years': 0}},
+    {'run': {'periods_per_day': 0}},
+    {'run': {'workers': 0}},
+    {'run': {'connections': 0}},
+    {'layout': 'big'},
+    {'layout': {'schools': 0}},
+    {'layout': {'grade_levels': [5, 6]}},
+    {'layout': {'grade_levels': [6, 6]}},
+    {'layout': {'sections_per_grade': [3, 2]}},
+    {'layout': {'max_students': 51}},
+    {'layout': {'max_students': True}},
+    {'distributions': {'attendance': {'present': 1}}},
+    {'distributions': {'attendance': {'present': -1, 'absent': 1, 'late': 1, 'excused': 1}}},
+    {'distributions': {'exam_weights': {exam_type: 3 for exam_type in g.EXAM_TYPES}}},
+    {'catalog': {'departments': []}},
+    {'catalog': {'subjects': SUBJECTS[:7]}},
+    {'catalog': {'subjects': SUBJECTS + [['SUBA', 'Again']]}},
+    {'catalog': {'subjects': SUBJECTS + [['pe', 'Physical Education']]}},
+    {'catalog': {'subjects': SUBJECTS + [['X' * 18, 'Too long']]}},
+])
+def test_validate_scenario_rejects_bad_input(scenario):
+    assert g.validate_scenario(scenario)
+
+
+def test_validate_scenario_accepts_shipped_scenarios():
+    for name in sorted(os.listdir(SCENARIO_DIR)):
+        scenario = g.load_scenario(os.path.join(SCENARIO_DIR, name))
+        assert g.validate_scenario(copy.deepcopy(scenario)) == [], name
+    assert g.validate_scenario({'run': {'grades': 0, 'workers': 2}, 'catalog': {'subjects': SUBJECTS}}) == []
+
+
+def test_init_worker_applies_the_scenario(monkeypatch):
+    # What a spawn/forkserver worker runs before its first task
+    monkeypatch.setattr(g, 'CLASS_MAX_STUDENTS', g.CLASS_MAX_STUDENTS)
+    monkeypatch.setattr(g, 'WORKER_SETTINGS', {})
+    g.init_worker({'scenario': {'layout': {'max_students': 17}}})
+    assert g.CLASS_MAX_STUDENTS == 17